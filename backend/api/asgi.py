@@ -0,0 +1,9 @@
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api.settings.production")
+# Probe-bound views (check-now, run-checks) run async under ASGI; see apps/core/async_views.py.
+os.environ.setdefault("ASYNC_PROBE_VIEWS", "1")
+
+app = get_asgi_application()
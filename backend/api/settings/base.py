@@ -23,6 +23,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "apps.core.profiling.ProfilingMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -35,6 +36,11 @@ MIDDLEWARE = [
 ROOT_URLCONF = "api.urls"
 
 WSGI_APPLICATION = "api.wsgi.app"
+ASGI_APPLICATION = "api.asgi.app"
+
+# Serve check-now and run-checks with the async views (apps/core/async_views.py). On by default
+# under api/asgi.py; under WSGI each async view would need its own event loop, so it stays off.
+ASYNC_PROBE_VIEWS = os.environ.get("ASYNC_PROBE_VIEWS", "0").lower() in ("true", "1", "yes")
 
 TEMPLATES = [
     {
@@ -67,14 +73,88 @@ USE_TZ = True
 STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# JWT_AUTH_MODE: "claims" (default) authenticates from signed token claims without loading
+# auth_user on every request (apps/core/authentication.py); "db" uses simplejwt's JWTAuthentication.
+_jwt_authentication_class = (
+    "rest_framework_simplejwt.authentication.JWTAuthentication"
+    if os.environ.get("JWT_AUTH_MODE", "claims").lower() == "db"
+    else "apps.core.authentication.ClaimsJWTAuthentication"
+)
+
+# API_RENDERER: "orjson" (default; falls back to the stdlib encoder if orjson is missing) or "json".
+_json_renderer_class = (
+    "rest_framework.renderers.JSONRenderer"
+    if os.environ.get("API_RENDERER", "orjson").lower() == "json"
+    else "apps.core.renderers.ORJSONRenderer"
+)
+
 REST_FRAMEWORK = {
-    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"],
+    "DEFAULT_RENDERER_CLASSES": [_json_renderer_class],
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        _jwt_authentication_class,
     ],
     "DEFAULT_PERMISSION_CLASSES": [],  # per-view; health/cron use AllowAny
 }
 
+SIMPLE_JWT = {
+    # Reject tokens issued before a password change (checked against the cached user state in "claims" mode).
+    "CHECK_REVOKE_TOKEN": os.environ.get("JWT_CHECK_REVOKE_TOKEN", "False").lower() in ("true", "1", "yes"),
+}
+
+# "claims" auth mode: how long a user's active/password state is cached; 0 trusts token claims alone.
+JWT_USER_STATE_CACHE_SECONDS = int(os.environ.get("JWT_USER_STATE_CACHE_SECONDS", "60"))
+
 # Allow both localhost and 127.0.0.1 so CORS works whether user opens app via localhost or 127.0.0.1
 _default_cors = "http://localhost:3000,http://127.0.0.1:3000"
 CORS_ALLOWED_ORIGINS = [o.strip() for o in os.environ.get("CORS_ORIGINS", _default_cors).split(",") if o.strip()]
+
+# Cache backend for the versioned read cache (apps/core/cache.py).
+# CACHE_BACKEND: locmem (default, per process), file (CACHE_LOCATION directory), redis or memcached (CACHE_URL).
+# redis needs the "redis" package, memcached "pymemcache" (pip install redis / pymemcache).
+_cache_backend = os.environ.get("CACHE_BACKEND", "locmem").lower()
+if _cache_backend == "file":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get("CACHE_LOCATION", "/tmp/api-status-cache"),
+        }
+    }
+elif _cache_backend == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ.get("CACHE_URL", "redis://127.0.0.1:6379"),
+        }
+    }
+elif _cache_backend == "memcached":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+            "LOCATION": os.environ.get("CACHE_URL", "127.0.0.1:11211"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "api-status",
+        }
+    }
+
+# The read cache is only correct when every instance sees the same version keys: bump_data_version
+# on one instance must invalidate reads on all of them. On by default for redis/memcached only; with
+# locmem (per process) or file (per host), e.g. on Vercel's separate instances, reads would go stale.
+READ_CACHE_ENABLED = os.environ.get(
+    "READ_CACHE_ENABLED", "1" if _cache_backend in ("redis", "memcached") else "0"
+).lower() in ("true", "1", "yes")
+
+# TTLs for cached reads: live windows (data may still change) and fully closed historical windows.
+READ_CACHE_TTL_SECONDS = int(os.environ.get("READ_CACHE_TTL_SECONDS", "60"))
+READ_CACHE_CLOSED_TTL_SECONDS = int(os.environ.get("READ_CACHE_CLOSED_TTL_SECONDS", str(24 * 60 * 60)))
+
+# Adaptive check intervals: default floor/ceiling for endpoints with adaptive_interval enabled.
+ADAPTIVE_INTERVAL_FLOOR_MINUTES = int(os.environ.get("ADAPTIVE_INTERVAL_FLOOR_MINUTES", "1"))
+ADAPTIVE_INTERVAL_CEILING_MINUTES = int(os.environ.get("ADAPTIVE_INTERVAL_CEILING_MINUTES", "60"))
+
+# Probe coalescing: a probe result (or manual check) this recent is reused instead of probing again.
+PROBE_FRESHNESS_SECONDS = int(os.environ.get("PROBE_FRESHNESS_SECONDS", "15"))
@@ -48,3 +48,8 @@ else:
                 "NAME": BASE_DIR / "db.sqlite3",
             }
         }
+
+# record_checks reads and then writes in one transaction. IMMEDIATE takes SQLite's write lock up
+# front, so concurrent writers wait for it instead of failing with "database is locked".
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["default"].setdefault("OPTIONS", {})["transaction_mode"] = "IMMEDIATE"
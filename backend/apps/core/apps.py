@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    name = "apps.core"
+
+    def ready(self):
+        from django.contrib.auth import get_user_model
+        from django.db.models.signals import post_delete, post_save
+
+        from .authentication import user_changed
+
+        # Deactivation, password changes and deletion apply on the next request instead of
+        # after JWT_USER_STATE_CACHE_SECONDS.
+        User = get_user_model()
+        post_save.connect(user_changed, sender=User, dispatch_uid="api-status-user-saved")
+        post_delete.connect(user_changed, sender=User, dispatch_uid="api-status-user-deleted")
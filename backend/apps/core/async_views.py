@@ -0,0 +1,128 @@
+"""
+Async versions of the probe-bound views, served when the app runs under ASGI (api/asgi.py).
+
+Under WSGI, check-now, batch check-now and run-checks hold a worker for the whole outbound
+request. These views await the probe instead (httpx, see probes.aprobe), so one process can
+have hundreds of probes in flight while it keeps serving the read views. Reads use the async
+ORM where it is a single query; other queries and writes (record_checks) run in a worker thread. Coalescing is the same as in the sync views.
+
+They replace the sync routes when settings.ASYNC_PROBE_VIEWS is on (api/asgi.py turns it on).
+"""
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+from rest_framework.exceptions import APIException, NotAuthenticated, ParseError
+from rest_framework.settings import api_settings
+
+from .coalescing import acheck_endpoint_now, acoalesced_probe, fresh_checks
+from .models import Endpoint
+from .probes import aprobe_many
+from .recording import record_checks
+from .scheduling import due_targets, with_last_checked_at
+from .serializers import CheckResultSerializer
+from .views import (
+    _batch_results,
+    _batch_selection,
+    _run_summary,
+    _RunWriter,
+    _validate_cron_secret,
+    run_checks as sync_run_checks,
+)
+
+# Probes in flight at once during one run_checks call (the rest of the pool is left for check-now).
+RUN_CHECKS_MAX_IN_FLIGHT = 200
+
+
+def _render(data, status=200):
+    """Render like a DRF Response would, with the first configured renderer."""
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(renderer.render(data), status=status, content_type=renderer.media_type)
+
+
+def _exception_response(exc):
+    """Render an APIException like DRF's exception handler (list/dict details as they are)."""
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    response = _render(data, status=exc.status_code)
+    if exc.status_code == 401:
+        response["WWW-Authenticate"] = 'Bearer realm="api"'
+    return response
+
+
+async def _authenticate(request):
+    """Run the configured DRF authentication classes. Returns the user, or raises NotAuthenticated."""
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        result = await sync_to_async(authentication_class().authenticate)(request)
+        if result is not None:
+            return result[0]
+    raise NotAuthenticated()
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+async def check_now(request, pk):
+    """Async EndpointViewSet.check_now."""
+    try:
+        user = await _authenticate(request)
+    except APIException as e:
+        return _exception_response(e)
+    endpoint = await Endpoint.objects.filter(pk=pk, user_id=user.id).afirst()
+    if endpoint is None:
+        return _render({"detail": "Not found."}, status=404)
+    check, created = await acheck_endpoint_now(endpoint)
+    return _render(CheckResultSerializer(check).data, status=201 if created else 200)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+async def batch_check_now(request):
+    """Async EndpointViewSet.batch_check_now. The body is parsed as JSON."""
+    try:
+        user = await _authenticate(request)
+        try:
+            data = json.loads(request.body) if request.body else {}
+        except ValueError:
+            raise ParseError()
+        endpoints, ids, deadline = await sync_to_async(_batch_selection)(user.id, data, request.GET.get("status"))
+    except APIException as e:
+        return _exception_response(e)
+    fresh = await sync_to_async(fresh_checks)([ep.pk for ep in endpoints])
+    results, unfinished = await aprobe_many(
+        [ep for ep in endpoints if ep.pk not in fresh], deadline, probe_fn=acoalesced_probe
+    )
+    created = await sync_to_async(record_checks)([(ep, results[ep.pk]) for ep in endpoints if ep.pk in results])
+    return _render(_batch_results(endpoints, ids, fresh, created, unfinished), status=201)
+
+
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+async def run_checks(request):
+    """Async views.run_checks. With ?profile=1 the sync view runs instead (cProfile needs one thread)."""
+    if not _validate_cron_secret(request):
+        return JsonResponse({"error": "Unauthorized"}, status=401)
+    if request.GET.get("profile", "").lower() in ("1", "true", "yes"):
+        return await sync_to_async(sync_run_checks)(request)
+    return JsonResponse(await _arun_due_checks())
+
+
+async def _arun_due_checks():
+    endpoints = [endpoint async for endpoint in with_last_checked_at(Endpoint.objects.all())]
+    targets, skipped = due_targets(endpoints, timezone.now())
+    targets = list(targets.values())
+    semaphore = asyncio.Semaphore(RUN_CHECKS_MAX_IN_FLIGHT)
+
+    async def probe_target(members):
+        async with semaphore:
+            return members, await acoalesced_probe(members[0])
+
+    # Written in chunks as probes complete, like the sync run.
+    writer = _RunWriter()
+    for completed in asyncio.as_completed([probe_target(members) for members in targets]):
+        if writer.add(*await completed):
+            await sync_to_async(writer.flush)()
+    await sync_to_async(writer.flush)()
+    return _run_summary(writer.pairs, skipped, len(targets))
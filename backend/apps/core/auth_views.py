@@ -11,6 +11,13 @@ from rest_framework_simplejwt.tokens import RefreshToken
 User = get_user_model()
 
 
+def _tokens_for_user(user):
+    """Refresh token (and, via access_token, access token) carrying the claims ClaimsUser reads."""
+    refresh = RefreshToken.for_user(user)
+    refresh["username"] = user.username
+    return refresh
+
+
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def register(request):
@@ -36,7 +43,7 @@ def register(request):
         )
     try:
         user = User.objects.create_user(username=username, password=password, email=email)
-        refresh = RefreshToken.for_user(user)
+        refresh = _tokens_for_user(user)
         return Response(
             {
                 "user": {"id": user.id, "username": user.username, "email": user.email or ""},
@@ -71,7 +78,7 @@ def login(request):
             {"detail": "Invalid credentials"},
             status=status.HTTP_401_UNAUTHORIZED,
         )
-    refresh = RefreshToken.for_user(user)
+    refresh = _tokens_for_user(user)
     return Response(
         {
             "user": {"id": user.id, "username": user.username, "email": user.email or ""},
@@ -84,7 +91,10 @@ def login(request):
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def me(request):
-    user = request.user
+    # request.user is built from token claims; email is not among them.
+    user = User.objects.filter(pk=request.user.id).values("id", "username", "email").first()
+    if user is None:
+        return Response({"detail": "User not found"}, status=status.HTTP_404_NOT_FOUND)
     return Response(
-        {"id": user.id, "username": user.username, "email": user.email or ""},
+        {"id": user["id"], "username": user["username"], "email": user["email"] or ""},
     )
@@ -0,0 +1,83 @@
+"""
+JWT authentication without a per-request auth_user query.
+
+simplejwt's JWTAuthentication loads the user row on every request, but our views only need
+request.user.id. ClaimsJWTAuthentication builds a lightweight ClaimsUser from the signed
+token claims (user id, username) instead.
+
+Because nothing is read from the database, a deleted or deactivated user (or, with
+SIMPLE_JWT["CHECK_REVOKE_TOKEN"], a changed password) would otherwise stay authenticated
+until the access token expires. When JWT_USER_STATE_CACHE_SECONDS > 0 the user's state is
+looked up once per TTL and cached. Saving or deleting a user drops that entry (see
+CoreConfig.ready), so the change applies on the next request; with a per-process cache only
+on the instance that made it, so use a shared CACHE_BACKEND. Bulk queryset.update() sends no
+signal and still waits for the TTL.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+USER_STATE_KEY = "api-status:auth-user:{}"
+
+
+class ClaimsUser(TokenUser):
+    """TokenUser whose id is the integer primary key, so it compares equal to Endpoint.user_id."""
+
+    @cached_property
+    def id(self):
+        return int(self.token[api_settings.USER_ID_CLAIM])
+
+
+def _user_state(user_id):
+    key = USER_STATE_KEY.format(user_id)
+    state = cache.get(key)
+    if state is None:
+        row = (
+            get_user_model().objects.filter(pk=user_id)
+            .values_list("is_active", "password")
+            .first()
+        )
+        state = {
+            "exists": row is not None,
+            "is_active": bool(row and row[0]),
+            "password_hash": get_md5_hash_password(row[1]) if row else "",
+        }
+        cache.set(key, state, timeout=settings.JWT_USER_STATE_CACHE_SECONDS)
+    return state
+
+
+def invalidate_user_state(user_id):
+    """Drop the cached state so the next request re-reads the user (e.g. after deactivation)."""
+    cache.delete(USER_STATE_KEY.format(user_id))
+
+
+def user_changed(sender, instance, **kwargs):
+    """post_save / post_delete receiver for the user model."""
+    invalidate_user_state(instance.pk)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidToken("Token contained no recognizable user identification") from e
+        if settings.JWT_USER_STATE_CACHE_SECONDS > 0:
+            state = _user_state(user_id)
+            if not state["exists"]:
+                raise AuthenticationFailed("User not found", code="user_not_found")
+            if api_settings.CHECK_USER_IS_ACTIVE and not state["is_active"]:
+                raise AuthenticationFailed("User is inactive", code="user_inactive")
+            if api_settings.CHECK_REVOKE_TOKEN and (
+                validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != state["password_hash"]
+            ):
+                raise AuthenticationFailed(
+                    "The user's password has been changed.", code="password_changed"
+                )
+        return ClaimsUser(validated_token)
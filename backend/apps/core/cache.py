@@ -0,0 +1,75 @@
+"""
+Versioned read cache for per-user dashboard data (analytics, stats, endpoint list).
+
+Every cached entry is keyed by user, query parameters and that user's data versions.
+Writes never delete entries; they bump a version so old keys simply stop being read and
+age out via their TTL. There are two versions per user:
+
+- "endpoints": bumped when an endpoint is created, edited or deleted.
+- "checks": bumped when new CheckResults are written.
+
+Windows that closed in the past (until < now) can no longer receive checks, so their keys
+omit the checks version and are cached with a long TTL.
+
+Reads are only cached when settings.READ_CACHE_ENABLED is on (by default with a shared redis
+or memcached backend). With a per-process or per-host cache, a bump on one instance would
+leave other instances serving stale data.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+KEY_PREFIX = "api-status"
+SCOPE_ENDPOINTS = "endpoints"
+SCOPE_CHECKS = "checks"
+
+
+def _version_key(user_id, scope):
+    return f"{KEY_PREFIX}:version:{user_id}:{scope}"
+
+
+def get_data_version(user_id, scope):
+    key = _version_key(user_id, scope)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock rather than 1 so an evicted version can never reuse old keys.
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_data_version(user_ids, *scopes):
+    """Invalidate cached reads for the given users by bumping their data version(s)."""
+    for user_id in set(user_ids):
+        if user_id is None:
+            continue
+        for scope in scopes:
+            key = _version_key(user_id, scope)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), timeout=None)
+
+
+def cached_response_data(user_id, name, params, compute, closed=False):
+    """
+    Return compute() for this user and query params (a dict), served from cache when the user's data
+    has not changed since it was stored. closed=True marks a historical window that no new
+    check can fall into: it ignores the checks version and uses the long TTL.
+    """
+    if not settings.READ_CACHE_ENABLED:
+        return compute()
+    query = urlencode(sorted((k, v) for k, v in params.items() if v is not None))
+    digest = hashlib.md5(query.encode()).hexdigest()
+    endpoints_version = get_data_version(user_id, SCOPE_ENDPOINTS)
+    checks_version = "closed" if closed else get_data_version(user_id, SCOPE_CHECKS)
+    key = f"{KEY_PREFIX}:{name}:{user_id}:{endpoints_version}:{checks_version}:{digest}"
+    data = cache.get(key)
+    if data is None:
+        data = compute()
+        ttl = settings.READ_CACHE_CLOSED_TTL_SECONDS if closed else settings.READ_CACHE_TTL_SECONDS
+        cache.set(key, data, timeout=ttl)
+    return data
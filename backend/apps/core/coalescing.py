@@ -0,0 +1,201 @@
+"""
+Single-flight coalescing of probes and manual checks.
+
+Concurrent callers that want the same thing share one execution:
+
+- coalesced_probe(endpoint): one outbound probe per probe target (see probes.target_key).
+  The result is kept in the cache for PROBE_FRESHNESS_SECONDS and reused by any endpoint
+  on the same target, whether the caller is check-now, batch check-now or run_checks.
+- check_endpoint_now(endpoint): one probe *and* one CheckResult per endpoint. A check
+  written within the freshness window is returned instead of probing again (see
+  fresh_checks, also used by batch check-now and run_checks).
+
+Within a process, followers wait on the leader's future. Across processes, a cache lock
+(cache.add) marks the leader. Other processes poll for its result until the probe timeout,
+then fall back to doing the work themselves. Cross-process coalescing needs a shared
+CACHE_BACKEND; with locmem it is per process.
+
+acoalesced_probe / acheck_endpoint_now are the async equivalents for the ASGI views. They
+share cache keys and locks with the sync functions, so sync and async callers coalesce too.
+"""
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import Future
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import CheckResult
+from .probes import PROBE_TIMEOUT_SECONDS, aprobe_endpoint, probe_endpoint, target_key
+from .recording import record_checks
+
+POLL_SECONDS = 0.2
+
+_inflight_lock = threading.Lock()
+_inflight = {}
+_async_inflight = {}
+
+
+def coalesce(key, compute, fetch_fresh, timeout):
+    """
+    Run compute() once for all concurrent callers sharing key. fetch_fresh() returns an
+    already available result (or None); it is tried before computing and, by callers in
+    other processes, while waiting on the leader. Returns (result, computed), where computed
+    is True only for the one caller whose compute() produced the result.
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = _inflight[key] = Future()
+    if not leader:
+        return future.result()[0], False
+    try:
+        result, computed = _coalesce_across_processes(key, compute, fetch_fresh, timeout)
+        future.set_result((result, computed))
+        return result, computed
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def _coalesce_across_processes(key, compute, fetch_fresh, timeout):
+    fresh = fetch_fresh()
+    if fresh is not None:
+        return fresh, False
+    lock_key = f"api-status:inflight:{key}"
+    if cache.add(lock_key, 1, timeout=timeout + 5):
+        try:
+            return compute(), True
+        finally:
+            cache.delete(lock_key)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        time.sleep(POLL_SECONDS)
+        fresh = fetch_fresh()
+        if fresh is not None:
+            return fresh, False
+        if cache.get(lock_key) is None:
+            break
+    fresh = fetch_fresh()
+    return (fresh, False) if fresh is not None else (compute(), True)
+
+
+def _target_cache_key(endpoint):
+    digest = hashlib.md5(repr(target_key(endpoint)).encode()).hexdigest()
+    return f"probe:{digest}"
+
+
+def coalesced_probe(endpoint, timeout=PROBE_TIMEOUT_SECONDS):
+    """probe_endpoint(), shared by concurrent callers and reused while fresh for the same target."""
+    key = _target_cache_key(endpoint)
+    result_key = f"api-status:result:{key}"
+
+    def compute():
+        result = probe_endpoint(endpoint, timeout)
+        cache.set(result_key, result, timeout=settings.PROBE_FRESHNESS_SECONDS)
+        return result
+
+    return cache.get(result_key) or coalesce(key, compute, lambda: cache.get(result_key), timeout)[0]
+
+
+def fresh_since():
+    """Checks written after this are fresh: returned as they are instead of checking again."""
+    return timezone.now() - timezone.timedelta(seconds=settings.PROBE_FRESHNESS_SECONDS)
+
+
+def fresh_checks(endpoint_ids):
+    """{endpoint_id: its latest CheckResult} for the given endpoints checked since fresh_since()."""
+    checks = {}
+    for check in CheckResult.objects.filter(endpoint_id__in=endpoint_ids, checked_at__gte=fresh_since()):
+        checks.setdefault(check.endpoint_id, check)
+    return checks
+
+
+def check_endpoint_now(endpoint):
+    """
+    Check one endpoint on demand. Returns (check, created): a CheckResult written since
+    fresh_since() is returned as is (created=False); otherwise the endpoint is probed
+    (coalesced per target) and a new CheckResult recorded. Concurrent callers share one
+    check, and only one of them gets created=True.
+    """
+    def fetch_fresh():
+        return endpoint.checks.filter(checked_at__gte=fresh_since()).first()
+
+    def compute():
+        [check] = record_checks([(endpoint, coalesced_probe(endpoint))])
+        return check
+
+    return coalesce(f"check-now:{endpoint.pk}", compute, fetch_fresh, PROBE_TIMEOUT_SECONDS)
+
+
+async def acoalesce(key, compute, fetch_fresh, timeout):
+    """Async coalesce(): compute and fetch_fresh are coroutine functions."""
+    inflight_key = (asyncio.get_running_loop(), key)
+    task = _async_inflight.get(inflight_key)
+    leader = task is None
+    if leader:
+        task = asyncio.ensure_future(_acoalesce_across_processes(key, compute, fetch_fresh, timeout))
+        _async_inflight[inflight_key] = task
+        task.add_done_callback(lambda _: _async_inflight.pop(inflight_key, None))
+    # Shielded so that a caller going away (client disconnect) doesn't cancel the shared work.
+    result, computed = await asyncio.shield(task)
+    return result, computed and leader
+
+
+async def _acoalesce_across_processes(key, compute, fetch_fresh, timeout):
+    fresh = await fetch_fresh()
+    if fresh is not None:
+        return fresh, False
+    lock_key = f"api-status:inflight:{key}"
+    if await cache.aadd(lock_key, 1, timeout=timeout + 5):
+        try:
+            return await compute(), True
+        finally:
+            await cache.adelete(lock_key)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(POLL_SECONDS)
+        fresh = await fetch_fresh()
+        if fresh is not None:
+            return fresh, False
+        if await cache.aget(lock_key) is None:
+            break
+    fresh = await fetch_fresh()
+    return (fresh, False) if fresh is not None else (await compute(), True)
+
+
+async def acoalesced_probe(endpoint, timeout=PROBE_TIMEOUT_SECONDS):
+    """Async coalesced_probe()."""
+    key = _target_cache_key(endpoint)
+    result_key = f"api-status:result:{key}"
+
+    async def fetch_fresh():
+        return await cache.aget(result_key)
+
+    async def compute():
+        result = await aprobe_endpoint(endpoint, timeout)
+        await cache.aset(result_key, result, timeout=settings.PROBE_FRESHNESS_SECONDS)
+        return result
+
+    return await fetch_fresh() or (await acoalesce(key, compute, fetch_fresh, timeout))[0]
+
+
+async def acheck_endpoint_now(endpoint):
+    """Async check_endpoint_now(). Only the probe is async; the write runs in a worker thread."""
+    async def fetch_fresh():
+        return await endpoint.checks.filter(checked_at__gte=fresh_since()).afirst()
+
+    async def compute():
+        result = await acoalesced_probe(endpoint)
+        [check] = await sync_to_async(record_checks)([(endpoint, result)])
+        return check
+
+    return await acoalesce(f"check-now:{endpoint.pk}", compute, fetch_fresh, PROBE_TIMEOUT_SECONDS)
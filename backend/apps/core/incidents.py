@@ -0,0 +1,95 @@
+"""
+Incident (down-period) log, maintained at write time by record_checks.
+
+Reports read only this small table: incident history, MTTR and time-weighted uptime
+(the fraction of wall-clock time an endpoint was up), which, unlike counting checks,
+does not depend on how often the endpoint was checked.
+"""
+from django.db.models import Q
+
+from .models import Incident
+from .projections import project_rows
+
+INCIDENT_FIELDS = (
+    "id",
+    "endpoint_id",
+    "started_at",
+    "ended_at",
+    "duration_seconds",
+    "error_message",
+)
+INCIDENT_LIST_LIMIT = 500
+
+
+def update_incidents(checks):
+    """Open an incident on a failure with none open; close the open one on a success."""
+    endpoint_ids = {check.endpoint_id for check in checks}
+    open_incidents = {}
+    for incident in Incident.objects.filter(
+        endpoint_id__in=endpoint_ids, ended_at__isnull=True
+    ).order_by("started_at"):
+        open_incidents.setdefault(incident.endpoint_id, incident)
+    to_create = []
+    to_close = []
+    for check in sorted(checks, key=lambda c: c.checked_at):
+        incident = open_incidents.get(check.endpoint_id)
+        if not check.success and incident is None:
+            incident = Incident(
+                endpoint_id=check.endpoint_id,
+                started_at=check.checked_at,
+                error_message=check.error_message,
+            )
+            open_incidents[check.endpoint_id] = incident
+            to_create.append(incident)
+        elif check.success and incident is not None:
+            incident.ended_at = check.checked_at
+            incident.duration_seconds = int((check.checked_at - incident.started_at).total_seconds())
+            del open_incidents[check.endpoint_id]
+            if incident.pk is not None:
+                to_close.append(incident)
+    if to_create:
+        Incident.objects.bulk_create(to_create)
+    if to_close:
+        Incident.objects.bulk_update(to_close, ["ended_at", "duration_seconds"])
+
+
+def incident_report(endpoints, since_dt, until_dt, now):
+    """
+    Incidents overlapping [since_dt, until_dt] for the given Endpoint queryset (newest first,
+    at most INCIDENT_LIST_LIMIT), plus a summary: incident count, MTTR over incidents that
+    ended in the window, total downtime, and time-weighted uptime. Each endpoint's observed
+    time starts at the later of since_dt and its creation.
+    """
+    until_dt = min(until_dt, now)
+    observed_seconds = 0.0
+    for created_at in endpoints.values_list("created_at", flat=True):
+        start = max(since_dt, created_at)
+        if until_dt > start:
+            observed_seconds += (until_dt - start).total_seconds()
+    incidents = Incident.objects.filter(
+        Q(ended_at__isnull=True) | Q(ended_at__gte=since_dt),
+        endpoint__in=endpoints,
+        started_at__lte=until_dt,
+    )
+    downtime_seconds = 0.0
+    repair_seconds = []
+    count = 0
+    for started_at, ended_at, duration in incidents.values_list("started_at", "ended_at", "duration_seconds"):
+        count += 1
+        start = max(started_at, since_dt)
+        end = min(ended_at or until_dt, until_dt)
+        if end > start:
+            downtime_seconds += (end - start).total_seconds()
+        if ended_at is not None and ended_at <= until_dt:
+            repair_seconds.append(duration)
+    return {
+        "incidents": project_rows(incidents.order_by("-started_at")[:INCIDENT_LIST_LIMIT], INCIDENT_FIELDS),
+        "summary": {
+            "incident_count": count,
+            "mttr_seconds": round(sum(repair_seconds) / len(repair_seconds), 1) if repair_seconds else None,
+            "downtime_seconds": round(downtime_seconds, 1),
+            "uptime_pct": (
+                round(100.0 * (1 - downtime_seconds / observed_seconds), 3) if observed_seconds else None
+            ),
+        },
+    }
@@ -0,0 +1,80 @@
+"""
+Benchmark the check-history read path: ModelSerializer + JSONRenderer versus the
+values_list projection + ORJSONRenderer. Sample rows are written inside a transaction
+that is rolled back, so this is safe to run against any database.
+
+    python manage.py bench_serialization --rows 500 --repeat 20
+"""
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.models import CheckResult, Endpoint
+from apps.core.projections import check_result_rows
+from apps.core.renderers import ORJSONRenderer
+from apps.core.serializers import CheckResultSerializer
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Measure per-row serialization time of check history (DRF serializer vs fast path)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        repeat = options["repeat"]
+        try:
+            with transaction.atomic():
+                self._run(rows, repeat)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _run(self, rows, repeat):
+        endpoint = Endpoint.objects.create(name="bench", url="https://example.com/health")
+        now = timezone.now()
+        CheckResult.objects.bulk_create(
+            CheckResult(
+                endpoint=endpoint,
+                status_code=200 if i % 10 else 503,
+                response_time_ms=100 + i % 50,
+                success=bool(i % 10),
+                error_message="" if i % 10 else "HTTP 503",
+            )
+            for i in range(rows)
+        )
+        CheckResult.objects.filter(endpoint=endpoint).update(checked_at=now)
+        qs = CheckResult.objects.filter(endpoint=endpoint)[:rows]
+
+        def serializer_path():
+            return JSONRenderer().render(CheckResultSerializer(qs.all(), many=True).data)
+
+        def fast_path():
+            return ORJSONRenderer().render(check_result_rows(qs.all()))
+
+        if serializer_path() != fast_path():
+            self.stderr.write(self.style.WARNING("Outputs differ between the two paths."))
+        self.stdout.write(f"{rows} rows, best and median of {repeat} runs (query included):")
+        paths = (
+            ("ModelSerializer + JSONRenderer", serializer_path),
+            ("values_list + ORJSONRenderer", fast_path),
+        )
+        for name, fn in paths:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                fn()
+                timings.append(time.perf_counter() - start)
+            best = min(timings) / rows * 1e6
+            median = statistics.median(timings) / rows * 1e6
+            self.stdout.write(f"  {name:32} {best:8.2f} us/row best  {median:8.2f} us/row median")
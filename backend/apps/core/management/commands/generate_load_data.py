@@ -0,0 +1,250 @@
+"""
+Generate production-sized synthetic data: users, endpoints, months of CheckResult history
+and the matching Incident log. No network access; output depends only on the arguments
+(same --seed and --end => same data).
+
+    python manage.py generate_load_data --users 50 --endpoints-per-user 20 --days 90 --seed 1
+
+Checks are inserted in batches of --batch-size rows, with COPY on Postgres and
+bulk_create elsewhere.
+"""
+import csv
+import io
+import math
+import random
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.core.models import CheckResult, Endpoint, Incident
+
+INTERVAL_CHOICES = (1, 5, 5, 5, 15, 30, 60)
+TIMEOUT_MS = 10000
+CHECK_COLUMNS = ("endpoint_id", "status_code", "response_time_ms", "success", "checked_at", "error_message")
+
+
+@contextmanager
+def explicit_timestamps(model, *field_names):
+    """Let bulk_create keep the given auto_now / auto_now_add values instead of overwriting them with now()."""
+    fields = [model._meta.get_field(name) for name in field_names]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class Command(BaseCommand):
+    help = "Create synthetic users, endpoints and check history for load and performance testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--endpoints-per-user", type=int, default=20)
+        parser.add_argument("--days", type=int, default=90, help="Days of check history per endpoint.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--end",
+            help="ISO datetime the history ends at (default: now, rounded down to the hour).",
+        )
+        parser.add_argument("--prefix", default="load", help="Username prefix; must not exist yet.")
+        parser.add_argument(
+            "--shared-urls",
+            type=int,
+            default=50,
+            help="Size of the pool of public URLs that several endpoints share (0 = all unique).",
+        )
+        parser.add_argument("--shared-ratio", type=float, default=0.3, help="Share of endpoints using the pool.")
+        parser.add_argument("--failure-rate", type=float, default=0.005, help="Chance any single check fails.")
+        parser.add_argument("--outages-per-month", type=float, default=2.0, help="Mean outages per endpoint.")
+        parser.add_argument("--outage-minutes", type=float, default=30.0, help="Median outage length.")
+        parser.add_argument(
+            "--flapping-ratio",
+            type=float,
+            default=0.05,
+            help="Share of endpoints that flap (fail ~30%% of checks) during their outages.",
+        )
+        parser.add_argument("--latency-ms", type=float, default=180.0, help="Median response time.")
+        parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal sigma of response time.")
+        parser.add_argument("--batch-size", type=int, default=50000)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        end = self._parse_end(options["end"])
+        start = end - timedelta(days=options["days"])
+        prefix = f"{options['prefix']}-{options['seed']}"
+        User = get_user_model()
+        if User.objects.filter(username__startswith=f"{prefix}-").exists():
+            raise CommandError(f"Users with prefix '{prefix}-' already exist; use another --prefix or --seed.")
+
+        with transaction.atomic():
+            endpoints = self._create_endpoints(rng, options, prefix, start)
+        self.stdout.write(f"Created {options['users']} users and {len(endpoints)} endpoints.")
+
+        writer = self._copy_checks if connection.vendor == "postgresql" else self._bulk_create_checks
+        batch = []
+        incidents = []
+        total = 0
+        for endpoint in endpoints:
+            for row in self._history(rng, options, endpoint, start, end, incidents):
+                batch.append(row)
+                if len(batch) >= options["batch_size"]:
+                    total += self._flush(writer, batch)
+                    batch = []
+                    self.stdout.write(f"  {total} checks written")
+        total += self._flush(writer, batch)
+        for i in range(0, len(incidents), options["batch_size"]):
+            Incident.objects.bulk_create(incidents[i:i + options["batch_size"]])
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {total} checks and {len(incidents)} incidents from {start.isoformat()} to {end.isoformat()}."
+        ))
+
+    def _parse_end(self, value):
+        if not value:
+            return timezone.now().replace(minute=0, second=0, microsecond=0)
+        try:
+            end = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError as e:
+            raise CommandError(f"Invalid --end: {value}") from e
+        return timezone.make_aware(end) if timezone.is_naive(end) else end
+
+    def _create_endpoints(self, rng, options, prefix, start):
+        User = get_user_model()
+        password = make_password(None)
+        users = User.objects.bulk_create(
+            User(username=f"{prefix}-{i}", password=password) for i in range(options["users"])
+        )
+        if any(user.pk is None for user in users):
+            users = list(User.objects.filter(username__startswith=f"{prefix}-").order_by("id"))
+        shared = [f"https://shared-{k}.example.test/health" for k in range(options["shared_urls"])]
+        endpoints = []
+        for i, user in enumerate(users):
+            for j in range(options["endpoints_per_user"]):
+                if shared and rng.random() < options["shared_ratio"]:
+                    url = rng.choice(shared)
+                else:
+                    url = f"https://svc-{prefix}-{i}-{j}.example.test/health"
+                endpoints.append(Endpoint(
+                    user=user,
+                    name=f"Service {j}",
+                    url=url,
+                    interval_minutes=rng.choice(INTERVAL_CHOICES),
+                    created_at=start,
+                    updated_at=start,
+                ))
+        with explicit_timestamps(Endpoint, "created_at", "updated_at"):
+            Endpoint.objects.bulk_create(endpoints, batch_size=1000)
+        if any(ep.pk is None for ep in endpoints):
+            endpoints = list(Endpoint.objects.filter(user__in=users).order_by("id"))
+        return endpoints
+
+    def _outages(self, rng, options, start, end):
+        """Sorted (start, end) outage windows for one endpoint."""
+        days = (end - start).total_seconds() / 86400
+        count = self._poisson(rng, options["outages_per_month"] * days / 30)
+        mu = math.log(max(options["outage_minutes"], 1))
+        windows = []
+        for _ in range(count):
+            begin = start + timedelta(seconds=rng.uniform(0, (end - start).total_seconds()))
+            windows.append((begin, begin + timedelta(minutes=rng.lognormvariate(mu, 0.8))))
+        return sorted(windows)
+
+    @staticmethod
+    def _poisson(rng, lam):
+        # Knuth's method; lam is small (outages per endpoint over the whole history).
+        threshold, k, p = math.exp(-lam), 0, 1.0
+        while True:
+            p *= rng.random()
+            if p <= threshold:
+                return k
+            k += 1
+
+    def _history(self, rng, options, endpoint, start, end, incidents):
+        """Yield check rows for one endpoint in time order, appending its incidents."""
+        outages = self._outages(rng, options, start, end)
+        flapping = rng.random() < options["flapping_ratio"]
+        median = options["latency_ms"] * rng.uniform(0.3, 3.0)
+        mu = math.log(median)
+        step = timedelta(minutes=endpoint.interval_minutes)
+        checked_at = start + timedelta(seconds=rng.uniform(0, step.total_seconds()))
+        outage_index = 0
+        incident = None
+        while checked_at < end:
+            while outage_index < len(outages) and outages[outage_index][1] < checked_at:
+                outage_index += 1
+            in_outage = outage_index < len(outages) and outages[outage_index][0] <= checked_at
+            if in_outage:
+                success = flapping and rng.random() < 0.7
+            else:
+                success = rng.random() >= options["failure_rate"]
+            if success:
+                status_code = 200
+                response_time_ms = min(int(rng.lognormvariate(mu, options["latency_sigma"])), TIMEOUT_MS - 1)
+                error_message = ""
+            elif rng.random() < 0.3:
+                status_code = None
+                response_time_ms = TIMEOUT_MS
+                error_message = "Read timed out. (read timeout=10)"
+            else:
+                status_code = rng.choice((500, 502, 503, 504))
+                response_time_ms = int(rng.lognormvariate(mu, options["latency_sigma"]))
+                error_message = f"HTTP {status_code}"
+            if not success and incident is None:
+                incident = Incident(endpoint_id=endpoint.pk, started_at=checked_at, error_message=error_message)
+            elif success and incident is not None:
+                incident.ended_at = checked_at
+                incident.duration_seconds = int((checked_at - incident.started_at).total_seconds())
+                incidents.append(incident)
+                incident = None
+            yield (endpoint.pk, status_code, response_time_ms, success, checked_at, error_message)
+            jitter = timedelta(seconds=rng.uniform(-2, 2))
+            checked_at = checked_at + step + jitter
+        if incident is not None:
+            incidents.append(incident)
+
+    def _flush(self, writer, rows):
+        if rows:
+            with transaction.atomic():
+                writer(rows)
+        return len(rows)
+
+    def _bulk_create_checks(self, rows):
+        with explicit_timestamps(CheckResult, "checked_at"):
+            CheckResult.objects.bulk_create(
+                (CheckResult(**dict(zip(CHECK_COLUMNS, row))) for row in rows),
+                batch_size=5000,
+            )
+
+    def _copy_checks(self, rows):
+        buf = io.StringIO()
+        out = csv.writer(buf)
+        for endpoint_id, status_code, response_time_ms, success, checked_at, error_message in rows:
+            out.writerow((
+                endpoint_id,
+                "" if status_code is None else status_code,
+                response_time_ms,
+                "t" if success else "f",
+                checked_at.isoformat(),
+                error_message,
+            ))
+        buf.seek(0)
+        table = CheckResult._meta.db_table
+        # Empty CSV fields load as NULL (status_code); FORCE_NOT_NULL keeps error_message "".
+        sql = (
+            f"COPY {table} ({', '.join(CHECK_COLUMNS)}) FROM STDIN "
+            "WITH (FORMAT csv, FORCE_NOT_NULL (error_message))"
+        )
+        with connection.cursor() as cursor:
+            raw = cursor.cursor
+            if hasattr(raw, "copy_expert"):  # psycopg2
+                raw.copy_expert(sql, buf)
+            else:  # psycopg 3
+                with raw.copy(sql) as copy:
+                    copy.write(buf.getvalue())
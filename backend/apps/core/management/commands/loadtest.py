@@ -0,0 +1,183 @@
+"""
+Compare request throughput of running servers (e.g. WSGI vs ASGI) under a mix of slow
+check-now calls and fast reads.
+
+    gunicorn api.wsgi:app --bind 127.0.0.1:8000 --workers 2 --threads 8
+    uvicorn api.asgi:app --port 8001 --workers 2
+    python manage.py loadtest --target wsgi=http://127.0.0.1:8000 --target asgi=http://127.0.0.1:8001 \
+        --username loadtest --password ... --probe-clients 100 --read-clients 10 --duration 20
+
+For each target the command logs in, creates one endpoint per probe client (each on its own
+probe target, so coalescing doesn't merge them), then for --duration seconds has every probe
+client call check-now on its endpoint in a loop while the read clients GET --read-path.
+The endpoints are deleted afterwards. Probes go to a local server started by this command
+that answers after --probe-delay seconds (or to --slow-url), so the servers under test must
+be able to reach it. Run them with PROBE_FRESHNESS_SECONDS=0, or repeated checks are
+served from the freshness window (counted as "reused").
+"""
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    delay = 1.0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        time.sleep(self.delay)
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class _Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.errors = 0
+        self.reused = 0
+
+    def add(self, seconds, ok, reused=False):
+        with self.lock:
+            if ok:
+                self.latencies.append(seconds)
+                self.reused += reused
+            else:
+                self.errors += 1
+
+    def row(self, duration):
+        lat = sorted(self.latencies)
+        if not lat:
+            return f"{0:>8.1f}/s  errors {self.errors}"
+        p95 = lat[min(len(lat) - 1, int(len(lat) * 0.95))]
+        line = (
+            f"{len(lat) / duration:>8.1f}/s  p50 {statistics.median(lat) * 1000:>7.0f} ms  "
+            f"p95 {p95 * 1000:>7.0f} ms  max {lat[-1] * 1000:>7.0f} ms  errors {self.errors}"
+        )
+        return f"{line}  reused {self.reused}" if self.reused else line
+
+
+class Command(BaseCommand):
+    help = "Load-test running servers with concurrent check-now calls and reads, and compare throughput."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            action="append",
+            required=True,
+            metavar="NAME=BASE_URL",
+            help="Server to test, e.g. asgi=http://127.0.0.1:8001 (or .../api/v1). Repeatable.",
+        )
+        parser.add_argument("--username", required=True)
+        parser.add_argument("--password", required=True)
+        parser.add_argument("--duration", type=float, default=20.0, help="Seconds of load per target.")
+        parser.add_argument("--probe-clients", type=int, default=50, help="Concurrent check-now loops.")
+        parser.add_argument("--read-clients", type=int, default=10, help="Concurrent read loops.")
+        parser.add_argument("--read-path", default="dashboard/stats/")
+        parser.add_argument("--probe-delay", type=float, default=1.0, help="Response delay of the local slow server.")
+        parser.add_argument("--slow-port", type=int, default=0, help="Port of the local slow server (0 = any).")
+        parser.add_argument("--slow-host", default="127.0.0.1", help="Host the servers under test reach it by.")
+        parser.add_argument("--slow-url", help="Use this URL as the probe target instead of the local server.")
+
+    def handle(self, *args, **options):
+        targets = []
+        for value in options["target"]:
+            name, sep, base_url = value.partition("=")
+            if not sep or not base_url.startswith(("http://", "https://")):
+                raise CommandError(f"Invalid --target {value!r}; expected NAME=http://host:port")
+            targets.append((name, base_url.rstrip("/") + "/"))
+
+        server = None
+        slow_url = options["slow_url"]
+        if not slow_url:
+            _SlowHandler.delay = options["probe_delay"]
+            server = ThreadingHTTPServer((options["slow_host"], options["slow_port"]), _SlowHandler)
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            slow_url = f"http://{options['slow_host']}:{server.server_address[1]}/slow"
+        try:
+            results = [(name, *self._run_target(name, base_url, slow_url, options)) for name, base_url in targets]
+        finally:
+            if server is not None:
+                server.shutdown()
+
+        self.stdout.write("")
+        self.stdout.write(f"{options['probe_clients']} check-now clients, {options['read_clients']} read clients, "
+                          f"{options['duration']:.0f}s each")
+        for name, checks, reads in results:
+            self.stdout.write(f"{name}")
+            self.stdout.write(f"  check-now {checks.row(options['duration'])}")
+            self.stdout.write(f"  reads     {reads.row(options['duration'])}")
+
+    def _run_target(self, name, base_url, slow_url, options):
+        session = requests.Session()
+        r = session.post(
+            base_url + "auth/login/",
+            json={"username": options["username"], "password": options["password"]},
+            timeout=30,
+        )
+        if r.status_code != 200:
+            raise CommandError(f"{name}: login failed ({r.status_code}): {r.text[:200]}")
+        headers = {"Authorization": f"Bearer {r.json()['access']}"}
+
+        endpoint_ids = []
+        try:
+            for i in range(options["probe_clients"]):
+                r = session.post(
+                    base_url + "endpoints/",
+                    json={
+                        "name": f"loadtest {name} {i}",
+                        "url": f"{slow_url}?loadtest={name}-{i}",
+                        "interval_minutes": 1440,
+                    },
+                    headers=headers,
+                    timeout=30,
+                )
+                if r.status_code != 201:
+                    raise CommandError(f"{name}: creating endpoint failed ({r.status_code}): {r.text[:200]}")
+                endpoint_ids.append(r.json()["id"])
+            self.stdout.write(f"{name}: {len(endpoint_ids)} endpoints created, running {options['duration']:.0f}s")
+            return self._load(base_url, headers, endpoint_ids, options)
+        finally:
+            for endpoint_id in endpoint_ids:
+                session.delete(f"{base_url}endpoints/{endpoint_id}/", headers=headers, timeout=30)
+
+    def _load(self, base_url, headers, endpoint_ids, options):
+        checks = _Stats()
+        reads = _Stats()
+        stop_at = time.monotonic() + options["duration"]
+
+        def loop(url, method, stats):
+            session = requests.Session()
+            while time.monotonic() < stop_at:
+                start = time.perf_counter()
+                try:
+                    r = session.request(method, url, headers=headers, timeout=60)
+                    ok = 200 <= r.status_code < 300
+                    reused = method == "POST" and r.status_code == 200
+                except requests.RequestException:
+                    ok, reused = False, False
+                stats.add(time.perf_counter() - start, ok, reused)
+
+        jobs = [(f"{base_url}endpoints/{i}/check-now/", "POST", checks) for i in endpoint_ids]
+        jobs += [(base_url + options["read_path"], "GET", reads)] * options["read_clients"]
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            for future in [executor.submit(loop, *job) for job in jobs]:
+                future.result()
+        return checks, reads
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_add_endpoint_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='endpoint',
+            name='adaptive_interval',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='endpoint',
+            name='current_interval_minutes',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='endpoint',
+            name='max_interval_minutes',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='endpoint',
+            name='min_interval_minutes',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='endpoint',
+            name='success_streak',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_endpoint_adaptive_interval'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='endpoint',
+            name='expected_content',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='endpoint',
+            name='max_body_bytes',
+            field=models.PositiveIntegerField(default=65536),
+        ),
+        migrations.AddField(
+            model_name='endpoint',
+            name='probe_mode',
+            field=models.CharField(choices=[('get', 'GET (full body)'), ('head', 'HEAD'), ('get_headers', 'GET (headers only)'), ('get_capped', 'GET (body up to max_body_bytes)')], default='get', max_length=16),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:43
+
+from django.db import migrations
+
+
+def backfill_incidents(apps, schema_editor):
+    """Derive incidents from existing check history, one endpoint at a time in check order."""
+    CheckResult = apps.get_model("core", "CheckResult")
+    Incident = apps.get_model("core", "Incident")
+    batch = []
+    endpoint_ids = CheckResult.objects.values_list("endpoint_id", flat=True).distinct()
+    for endpoint_id in endpoint_ids.order_by("endpoint_id"):
+        incident = None
+        checks = (
+            CheckResult.objects.filter(endpoint_id=endpoint_id)
+            .order_by("checked_at")
+            .values_list("checked_at", "success", "error_message")
+        )
+        for checked_at, success, error_message in checks.iterator():
+            if not success and incident is None:
+                incident = Incident(endpoint_id=endpoint_id, started_at=checked_at, error_message=error_message)
+            elif success and incident is not None:
+                incident.ended_at = checked_at
+                incident.duration_seconds = int((checked_at - incident.started_at).total_seconds())
+                batch.append(incident)
+                incident = None
+        if incident is not None:
+            batch.append(incident)
+        if len(batch) >= 1000:
+            Incident.objects.bulk_create(batch)
+            batch = []
+    Incident.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_incident'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_incidents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_backfill_incidents'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    # New indexes are built before the ones they replace are dropped.
+    operations = [
+        migrations.AddIndex(
+            model_name='checkresult',
+            index=models.Index(fields=['endpoint', '-checked_at', 'success', 'response_time_ms', 'id'], name='check_endpoint_latest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='endpoint',
+            index=models.Index(fields=['user', '-created_at'], name='endpoint_user_created_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='checkresult',
+            name='core_checkr_endpoin_f8fab0_idx',
+        ),
+        migrations.AlterField(
+            model_name='checkresult',
+            name='endpoint',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='checks', to='core.endpoint'),
+        ),
+    ]
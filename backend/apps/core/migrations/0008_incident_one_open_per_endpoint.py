@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:02
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def drop_duplicate_open_incidents(apps, schema_editor):
+    """Concurrent writers could open two incidents for one outage; keep the earliest."""
+    Incident = apps.get_model("core", "Incident")
+    open_incidents = Incident.objects.filter(ended_at__isnull=True)
+    duplicated = (
+        open_incidents.values("endpoint_id").annotate(n=Count("id")).filter(n__gt=1).values_list("endpoint_id", flat=True)
+    )
+    for endpoint_id in duplicated:
+        ids = list(open_incidents.filter(endpoint_id=endpoint_id).order_by("started_at", "id").values_list("id", flat=True))
+        Incident.objects.filter(id__in=ids[1:]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_covering_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_open_incidents, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='incident',
+            constraint=models.UniqueConstraint(condition=models.Q(('ended_at__isnull', True)), fields=('endpoint',), name='incident_one_open_per_endpoint'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_drop_endpoint_user_index'),
+    ]
+
+    # On Postgres, dropping the FK index would also drop the partial unique index on
+    # endpoint_id (introspected as a plain index on that column), so recreate the constraint.
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='incident',
+            name='incident_one_open_per_endpoint',
+        ),
+        migrations.AlterField(
+            model_name='incident',
+            name='endpoint',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='incidents', to='core.endpoint'),
+        ),
+        migrations.AddConstraint(
+            model_name='incident',
+            constraint=models.UniqueConstraint(condition=models.Q(('ended_at__isnull', True)), fields=('endpoint',), name='incident_one_open_per_endpoint'),
+        ),
+    ]
@@ -2,29 +2,58 @@ from django.conf import settings
 from django.db import models
 
 
+class ProbeMode(models.TextChoices):
+    GET = "get", "GET (full body)"
+    HEAD = "head", "HEAD"
+    GET_HEADERS = "get_headers", "GET (headers only)"
+    GET_CAPPED = "get_capped", "GET (body up to max_body_bytes)"
+
+
 class Endpoint(models.Model):
+    # No standalone index on user_id: endpoint_user_created_idx leads with it.
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         null=True,
         blank=True,
         related_name="endpoints",
+        db_index=False,
     )
     name = models.CharField(max_length=255)
     url = models.URLField()
     interval_minutes = models.PositiveIntegerField(default=5)
+    # Adaptive mode: the check interval moves between a floor and a ceiling (null = settings
+    # default) based on recent results. current_interval_minutes and success_streak are the
+    # scheduler's state and are maintained when checks are recorded.
+    adaptive_interval = models.BooleanField(default=False)
+    min_interval_minutes = models.PositiveIntegerField(null=True, blank=True)
+    max_interval_minutes = models.PositiveIntegerField(null=True, blank=True)
+    current_interval_minutes = models.PositiveIntegerField(null=True, blank=True)
+    success_streak = models.PositiveIntegerField(default=0)
+    # How the URL is probed. expected_content (optional) must appear in the body that is read:
+    # the whole body for "get", the first max_body_bytes for "get_capped".
+    probe_mode = models.CharField(max_length=16, choices=ProbeMode.choices, default=ProbeMode.GET)
+    max_body_bytes = models.PositiveIntegerField(default=65536)
+    expected_content = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # A user's endpoints in list order; also the driving side of per-user check joins.
+            models.Index(fields=["user", "-created_at"], name="endpoint_user_created_idx"),
+        ]
 
     def __str__(self):
         return self.name
 
 
 class CheckResult(models.Model):
-    endpoint = models.ForeignKey(Endpoint, on_delete=models.CASCADE, related_name="checks")
+    # No standalone index on endpoint_id: check_endpoint_latest_idx leads with it.
+    endpoint = models.ForeignKey(
+        Endpoint, on_delete=models.CASCADE, related_name="checks", db_index=False
+    )
     status_code = models.PositiveIntegerField(null=True, blank=True)
     response_time_ms = models.PositiveIntegerField(null=True, blank=True)
     success = models.BooleanField()
@@ -34,8 +63,47 @@ class CheckResult(models.Model):
     class Meta:
         ordering = ["-checked_at"]
         indexes = [
-            models.Index(fields=["endpoint", "checked_at"]),
+            # Serves "latest check per endpoint" (ORDER BY checked_at DESC LIMIT 1) and per-endpoint
+            # time windows. success, response_time_ms and id are key columns rather than INCLUDE
+            # columns so the index covers status, uptime and latency reads on SQLite as well as
+            # Postgres (index-only scans).
+            models.Index(
+                fields=["endpoint", "-checked_at", "success", "response_time_ms", "id"],
+                name="check_endpoint_latest_idx",
+            ),
         ]
 
     def __str__(self):
         return f"{self.endpoint.name} @ {self.checked_at}"
+
+
+class Incident(models.Model):
+    """
+    A period during which an endpoint was down: opened by a failing check while the endpoint
+    had no open incident, closed (ended_at, duration_seconds) by its next successful check.
+    Maintained when checks are recorded, so outage history never needs a CheckResult scan.
+    """
+    # No standalone index on endpoint_id: the (endpoint, started_at) index leads with it.
+    endpoint = models.ForeignKey(
+        Endpoint, on_delete=models.CASCADE, related_name="incidents", db_index=False
+    )
+    started_at = models.DateTimeField()
+    ended_at = models.DateTimeField(null=True, blank=True)
+    duration_seconds = models.PositiveIntegerField(null=True, blank=True)
+    error_message = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["endpoint", "started_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["endpoint"],
+                condition=models.Q(ended_at__isnull=True),
+                name="incident_one_open_per_endpoint",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.endpoint.name} down @ {self.started_at}"
@@ -0,0 +1,276 @@
+"""
+Outbound HTTP probes. A probe never touches the database: it returns the field values
+for a CheckResult so callers can decide how (and in what batch) to write them.
+
+Endpoints belong to users, and many users monitor the same public URLs. Endpoints that
+would send the same request (same normalized URL and probe options) are grouped under one
+probe target (see target_key) so the URL is fetched once and the result is written to each of those endpoints' history.
+
+aprobe / aprobe_endpoint / aprobe_many are the async equivalents used by the ASGI views, over httpx
+(optional dependency; without it they run the sync probe in a worker thread).
+"""
+import asyncio
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+
+from .models import ProbeMode
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+PROBE_TIMEOUT_SECONDS = 10
+
+# Connection pool size of the shared async client, i.e. how many async probes can be in flight per process.
+ASYNC_MAX_CONNECTIONS = 500
+
+# Modes that read (part of) the response body and can check expected_content.
+BODY_MODES = (ProbeMode.GET, ProbeMode.GET_CAPPED)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url):
+    """
+    Canonical form of a URL for grouping: lowercase scheme and host, default port dropped,
+    empty path as "/", fragment removed. Path and query are kept as-is (they are case-sensitive).
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"
+    netloc = host
+    if parts.port is not None and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{parts.port}"
+    if parts.username is not None:
+        userinfo = parts.username
+        if parts.password is not None:
+            userinfo = f"{userinfo}:{parts.password}"
+        netloc = f"{userinfo}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def target_key(endpoint):
+    """Endpoints with equal keys send identical probes and can share one result."""
+    mode = endpoint.probe_mode
+    max_body_bytes = endpoint.max_body_bytes if mode == ProbeMode.GET_CAPPED else None
+    expected_content = endpoint.expected_content if mode in BODY_MODES else ""
+    return (mode, normalize_url(endpoint.url), max_body_bytes, expected_content)
+
+
+def group_by_target(endpoints):
+    """Group endpoints by target_key, preserving order. Returns {key: [endpoint, ...]}."""
+    groups = {}
+    for endpoint in endpoints:
+        groups.setdefault(target_key(endpoint), []).append(endpoint)
+    return groups
+
+
+def _read_capped(response, max_body_bytes):
+    body = b""
+    for chunk in response.iter_content(chunk_size=min(max_body_bytes, 16384) or 1):
+        body += chunk
+        if len(body) >= max_body_bytes:
+            break
+    return body[:max_body_bytes]
+
+
+def _check_expected_content(success, error_message, body, encoding, expected_content):
+    """(success, error_message) after looking for expected_content in a 2xx response body."""
+    if success and expected_content:
+        text = body.decode(encoding or "utf-8", errors="replace")
+        if expected_content not in text:
+            return False, f"Expected content not found in first {len(body)} bytes"
+    return success, error_message
+
+
+def _error_result(start, error):
+    return {
+        "status_code": None,
+        "response_time_ms": int((time.perf_counter() - start) * 1000),
+        "success": False,
+        "error_message": str(error) or type(error).__name__,
+    }
+
+
+def probe(
+    url,
+    timeout=PROBE_TIMEOUT_SECONDS,
+    mode=ProbeMode.GET,
+    max_body_bytes=None,
+    expected_content="",
+):
+    """
+    Probe url and return CheckResult field values (status_code, response_time_ms, success, error_message).
+
+    mode is a ProbeMode: "head" sends HEAD; "get_headers" streams a GET and closes it once the
+    status line and headers arrive; "get_capped" reads at most max_body_bytes of the body;
+    "get" reads the whole body. In every mode response_time_ms is the time until the response
+    headers arrived, so it is comparable across modes. If expected_content is set (body modes
+    only), a 2xx response whose body does not contain it counts as a failure.
+    """
+    method = "HEAD" if mode == ProbeMode.HEAD else "GET"
+    start = time.perf_counter()
+    try:
+        with requests.request(method, url, timeout=timeout, stream=True, allow_redirects=True) as r:
+            elapsed_ms = int((time.perf_counter() - start) * 1000)
+            success = 200 <= r.status_code < 300
+            error_message = "" if success else f"HTTP {r.status_code}"
+            if mode in BODY_MODES:
+                if mode == ProbeMode.GET_CAPPED:
+                    body = _read_capped(r, max_body_bytes or 0)
+                else:
+                    body = r.content
+                success, error_message = _check_expected_content(
+                    success, error_message, body, r.encoding, expected_content
+                )
+        return {
+            "status_code": r.status_code,
+            "response_time_ms": elapsed_ms,
+            "success": success,
+            "error_message": error_message,
+        }
+    except Exception as e:
+        return _error_result(start, e)
+
+
+def probe_endpoint(endpoint, timeout=PROBE_TIMEOUT_SECONDS):
+    """probe() with the endpoint's URL and probe options."""
+    return probe(
+        endpoint.url,
+        timeout,
+        endpoint.probe_mode,
+        endpoint.max_body_bytes,
+        endpoint.expected_content,
+    )
+
+
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _async_client():
+    """One pooled httpx.AsyncClient per event loop, shared by all async probes on it."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        limits = httpx.Limits(max_connections=ASYNC_MAX_CONNECTIONS, max_keepalive_connections=50)
+        client = _async_clients[loop] = httpx.AsyncClient(limits=limits)
+    return client
+
+
+async def _aread_capped(response, max_body_bytes):
+    body = b""
+    async for chunk in response.aiter_bytes(chunk_size=min(max_body_bytes, 16384) or 1):
+        body += chunk
+        if len(body) >= max_body_bytes:
+            break
+    return body[:max_body_bytes]
+
+
+async def aprobe(
+    url,
+    timeout=PROBE_TIMEOUT_SECONDS,
+    mode=ProbeMode.GET,
+    max_body_bytes=None,
+    expected_content="",
+):
+    """Async probe(): same arguments, semantics and return value, without holding a thread."""
+    if httpx is None:
+        return await asyncio.to_thread(probe, url, timeout, mode, max_body_bytes, expected_content)
+    method = "HEAD" if mode == ProbeMode.HEAD else "GET"
+    start = time.perf_counter()
+    try:
+        async with _async_client().stream(method, url, timeout=timeout, follow_redirects=True) as r:
+            elapsed_ms = int((time.perf_counter() - start) * 1000)
+            success = 200 <= r.status_code < 300
+            error_message = "" if success else f"HTTP {r.status_code}"
+            if mode in BODY_MODES:
+                if mode == ProbeMode.GET_CAPPED:
+                    body = await _aread_capped(r, max_body_bytes or 0)
+                else:
+                    body = await r.aread()
+                success, error_message = _check_expected_content(
+                    success, error_message, body, r.encoding, expected_content
+                )
+        return {
+            "status_code": r.status_code,
+            "response_time_ms": elapsed_ms,
+            "success": success,
+            "error_message": error_message,
+        }
+    except Exception as e:
+        return _error_result(start, e)
+
+
+async def aprobe_endpoint(endpoint, timeout=PROBE_TIMEOUT_SECONDS):
+    """aprobe() with the endpoint's URL and probe options."""
+    return await aprobe(
+        endpoint.url,
+        timeout,
+        endpoint.probe_mode,
+        endpoint.max_body_bytes,
+        endpoint.expected_content,
+    )
+
+
+def probe_many(endpoints, deadline_seconds, max_workers=20, probe_fn=probe_endpoint):
+    """
+    Probe endpoints concurrently, all within one overall deadline. Endpoints sharing a probe
+    target are probed once (via probe_fn(endpoint, timeout)) and all receive that result.
+    Returns (results, unfinished): results maps endpoint pk -> probe() values; unfinished lists
+    endpoints whose probe had not completed when the deadline passed.
+    """
+    endpoints = list(endpoints)
+    if not endpoints:
+        return {}, []
+    deadline = time.monotonic() + deadline_seconds
+    # Per-probe timeout never exceeds what is left of the batch deadline.
+    timeout = min(PROBE_TIMEOUT_SECONDS, deadline_seconds)
+    groups = group_by_target(endpoints)
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(groups)))
+    futures = {
+        executor.submit(probe_fn, members[0], timeout): members for members in groups.values()
+    }
+    done, _ = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+    # Don't block on stragglers; their sockets time out on their own.
+    executor.shutdown(wait=False, cancel_futures=True)
+    results = {}
+    unfinished = []
+    for future, members in futures.items():
+        if future in done:
+            result = future.result()
+            results.update((ep.pk, result) for ep in members)
+        else:
+            unfinished.extend(members)
+    return results, unfinished
+
+
+async def aprobe_many(endpoints, deadline_seconds, probe_fn=aprobe_endpoint):
+    """
+    Async probe_many(): probe_fn is a coroutine function. There is no worker limit (an async
+    probe holds no thread); the shared client's pool caps connections per process.
+    """
+    endpoints = list(endpoints)
+    if not endpoints:
+        return {}, []
+    timeout = min(PROBE_TIMEOUT_SECONDS, deadline_seconds)
+    groups = group_by_target(endpoints)
+    tasks = {asyncio.ensure_future(probe_fn(members[0], timeout)): members for members in groups.values()}
+    done, pending = await asyncio.wait(tasks, timeout=deadline_seconds)
+    for task in pending:
+        task.cancel()
+    results = {}
+    unfinished = []
+    for task, members in tasks.items():
+        if task in done:
+            result = task.result()
+            results.update((ep.pk, result) for ep in members)
+        else:
+            unfinished.extend(members)
+    return results, unfinished
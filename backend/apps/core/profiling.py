@@ -0,0 +1,194 @@
+"""
+Opt-in profiling of single production requests.
+
+A request is profiled only when it carries the header "X-Profile: <PROFILE_SECRET>" (and
+PROFILE_SECRET is set). Its whole path through the middleware stack (view, serializers,
+rendering) runs under cProfile, and every SQL query is timed via connection.execute_wrapper.
+The profile is written as a pstats file to PROFILE_DIR. The response gets a Server-Timing
+header (total and SQL time) and X-Profile-File. With "X-Profile-Format: text" the body is
+replaced by a readable report; with "X-Profile-Format: pstats" by the pstats file itself.
+
+One profile runs at a time per process; a second concurrent profiling request is served
+unprofiled (X-Profile-Skipped: busy). Up to Python 3.11 cProfile only observes the calling
+thread, so other requests are not affected. From 3.12 it is built on sys.monitoring and
+observes every thread of the process, so it would record (and slow down) requests running
+beside the profiled one; there a request is profiled only if the WSGI server runs one
+request per process at a time (wsgi.multithread false, e.g. gunicorn sync workers), and
+is otherwise served unprofiled (X-Profile-Skipped: threads). Under ASGI a request hops
+between the event loop and worker threads, so it is not profiled (X-Profile-Skipped:
+async); profile under WSGI instead.
+"""
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connection
+from django.http import HttpResponse
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_FORMAT_HEADER = "X-Profile-Format"
+REPORT_FUNCTIONS = 40
+REPORT_QUERIES = 20
+
+# From 3.12 cProfile uses sys.monitoring, which observes every thread of the process.
+PROFILER_OBSERVES_ALL_THREADS = sys.version_info >= (3, 12)
+
+_lock = threading.Lock()
+
+
+def _profile_dir():
+    return os.environ.get("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "api-status-profiles")
+
+
+def profiling_requested(request):
+    """True if the request carries the profiling header with the correct PROFILE_SECRET."""
+    secret = os.environ.get("PROFILE_SECRET", "")
+    value = request.headers.get(PROFILE_HEADER, "")
+    return bool(secret and value) and hmac.compare_digest(value, secret)
+
+
+def profiling_skip_reason(request):
+    """
+    Why a request that asked to be profiled can't be: "threads" when the profiler would also
+    observe other requests served by this process's threads, else None. Servers that don't
+    set wsgi.multithread (e.g. ASGI's worker threads) count as multithreaded.
+    """
+    if PROFILER_OBSERVES_ALL_THREADS and request.META.get("wsgi.multithread", True):
+        return "threads"
+    return None
+
+
+class ProfileRun:
+    def __init__(self, label):
+        self.label = label
+        self.profiler = cProfile.Profile()
+        self.queries = []
+        self.total_seconds = 0.0
+        self.path = None
+
+    def _time_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((time.perf_counter() - start, sql))
+
+    @property
+    def sql_seconds(self):
+        return sum(duration for duration, _ in self.queries)
+
+    def save(self):
+        """Write the pstats file and return its path."""
+        directory = _profile_dir()
+        os.makedirs(directory, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", self.label).strip("-")[:80]
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}-{slug}.prof"
+        self.path = os.path.join(directory, name)
+        self.profiler.dump_stats(self.path)
+        return self.path
+
+    def summary(self):
+        return {
+            "file": self.path,
+            "total_ms": round(self.total_seconds * 1000, 1),
+            "sql_ms": round(self.sql_seconds * 1000, 1),
+            "queries": len(self.queries),
+        }
+
+    def report(self):
+        out = io.StringIO()
+        out.write(f"{self.label}\n")
+        out.write(
+            f"total {self.total_seconds * 1000:.1f} ms, SQL {self.sql_seconds * 1000:.1f} ms "
+            f"in {len(self.queries)} queries\n\n"
+        )
+        out.write(f"Slowest queries (top {REPORT_QUERIES}):\n")
+        for duration, sql in sorted(self.queries, reverse=True)[:REPORT_QUERIES]:
+            out.write(f"  {duration * 1000:8.2f} ms  {sql}\n")
+        out.write("\n")
+        stats = pstats.Stats(self.profiler, stream=out)
+        stats.sort_stats("cumulative").print_stats(REPORT_FUNCTIONS)
+        return out.getvalue()
+
+
+@contextmanager
+def profile(label):
+    """
+    Profile the enclosed block (Python calls and SQL time), then save it. Yields the
+    ProfileRun, or None when another profile is already running in this process.
+    """
+    if not _lock.acquire(blocking=False):
+        yield None
+        return
+    run = ProfileRun(label)
+    try:
+        with connection.execute_wrapper(run._time_query):
+            start = time.perf_counter()
+            run.profiler.enable()
+            try:
+                yield run
+            finally:
+                run.profiler.disable()
+                run.total_seconds = time.perf_counter() - start
+        run.save()
+    finally:
+        _lock.release()
+
+
+class ProfilingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if profiling_requested(request):
+            response["X-Profile-Skipped"] = "async"
+        return response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not profiling_requested(request):
+            return self.get_response(request)
+        skip_reason = profiling_skip_reason(request)
+        if skip_reason:
+            response = self.get_response(request)
+            response["X-Profile-Skipped"] = skip_reason
+            return response
+        # Path only: query strings may carry secrets (e.g. cron ?secret=).
+        with profile(f"{request.method} {request.path}") as run:
+            response = self.get_response(request)
+        if run is None:
+            response["X-Profile-Skipped"] = "busy"
+            return response
+        fmt = request.headers.get(PROFILE_FORMAT_HEADER, "").lower()
+        status = response.status_code
+        if fmt == "text":
+            response = HttpResponse(run.report(), content_type="text/plain; charset=utf-8")
+        elif fmt == "pstats":
+            with open(run.path, "rb") as f:
+                response = HttpResponse(f.read(), content_type="application/octet-stream")
+            response["Content-Disposition"] = f'attachment; filename="{os.path.basename(run.path)}"'
+        summary = run.summary()
+        response["Server-Timing"] = (
+            f'total;dur={summary["total_ms"]}, sql;dur={summary["sql_ms"]};desc="{summary["queries"]} queries"'
+        )
+        response["X-Profile-File"] = os.path.basename(run.path)
+        response["X-Profile-Status"] = str(status)
+        return response
@@ -0,0 +1,102 @@
+"""
+Fast read path for high-volume JSON responses.
+
+Instead of instantiating models and running ModelSerializers, rows are read with
+values_list() and turned into dicts directly. The only fields that need encoding are
+datetimes; their encoder is built once per call and produces the same strings as DRF's
+DateTimeField (ISO 8601 in the current time zone, "Z" for UTC).
+"""
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .models import CheckResult
+
+CHECK_RESULT_FIELDS = (
+    "id",
+    "status_code",
+    "response_time_ms",
+    "success",
+    "checked_at",
+    "error_message",
+)
+ENDPOINT_LIST_FIELDS = (
+    "id",
+    "name",
+    "url",
+    "interval_minutes",
+    "adaptive_interval",
+    "min_interval_minutes",
+    "max_interval_minutes",
+    "current_interval_minutes",
+    "probe_mode",
+    "max_body_bytes",
+    "expected_content",
+    "created_at",
+    "updated_at",
+)
+DATETIME_FIELDS = frozenset(("checked_at", "created_at", "updated_at", "started_at", "ended_at"))
+
+
+def datetime_encoder():
+    """Return a function encoding an aware datetime (or None) like DRF's DateTimeField."""
+    tz = timezone.get_current_timezone()
+    # Values come back from the database in UTC; only convert when serving another zone.
+    convert = getattr(tz, "key", str(tz)) not in ("UTC", "Etc/UTC")
+
+    def encode(value):
+        if value is None:
+            return None
+        if convert:
+            value = value.astimezone(tz)
+        text = value.isoformat()
+        if text.endswith("+00:00"):
+            text = text[:-6] + "Z"
+        return text
+
+    return encode
+
+
+def project_rows(qs, fields):
+    """values_list(*fields) as a list of dicts, datetime fields encoded to strings."""
+    encode = datetime_encoder()
+    positions = [i for i, name in enumerate(fields) if name in DATETIME_FIELDS]
+    rows = []
+    for values in qs.values_list(*fields):
+        if positions:
+            values = list(values)
+            for i in positions:
+                values[i] = encode(values[i])
+        rows.append(dict(zip(fields, values)))
+    return rows
+
+
+def check_result_rows(qs):
+    """CheckResultSerializer-shaped dicts for a CheckResult queryset."""
+    return project_rows(qs, CHECK_RESULT_FIELDS)
+
+
+def with_latest_check_id(qs):
+    """Annotate an Endpoint queryset with _latest_check_id (None if never checked)."""
+    latest_id = (
+        CheckResult.objects.filter(endpoint=OuterRef("pk"))
+        .order_by("-checked_at")
+        .values("id")[:1]
+    )
+    return qs.annotate(_latest_check_id=Subquery(latest_id))
+
+
+def endpoint_list_rows(qs):
+    """
+    EndpointListSerializer-shaped dicts for an Endpoint queryset, in two queries: the
+    endpoints (annotated with their latest check id) and then those latest checks.
+    """
+    fields = ENDPOINT_LIST_FIELDS + ("_latest_check_id",)
+    rows = project_rows(with_latest_check_id(qs), fields)
+    check_ids = [row["_latest_check_id"] for row in rows if row["_latest_check_id"] is not None]
+    latest = {
+        check["id"]: check
+        for check in check_result_rows(CheckResult.objects.filter(pk__in=check_ids))
+    }
+    for row in rows:
+        row["latest_check"] = latest.get(row.pop("_latest_check_id"))
+    return rows
@@ -0,0 +1,39 @@
+"""
+Writing probe results. All CheckResult writes go through record_checks so that every
+side effect of a new check (incident log, adaptive interval state, cache invalidation) happens
+in one place and in one batch.
+"""
+from django.db import transaction
+
+from .cache import SCOPE_CHECKS, bump_data_version
+from .incidents import update_incidents
+from .models import CheckResult, Endpoint
+from .scheduling import ADAPTIVE_STATE_FIELDS, update_adaptive_state
+
+
+def record_checks(pairs):
+    """
+    Write one CheckResult per (endpoint, probe result) pair with a single bulk insert.
+    Returns the created CheckResults in the same order.
+
+    Checks, incidents and adaptive state are written in one transaction. Concurrent writers
+    (cron, check-now, batch check-now) for the same endpoints take turns: the endpoint rows
+    are locked first, in pk order, so each sees the other's open incidents and adaptive state.
+    """
+    pairs = list(pairs)
+    if not pairs:
+        return []
+    with transaction.atomic():
+        endpoint_ids = sorted({endpoint.pk for endpoint, _ in pairs})
+        # NO KEY UPDATE: doesn't block the FK KEY SHARE locks taken by other check inserts.
+        locked = Endpoint.objects.select_for_update(no_key=True).filter(pk__in=endpoint_ids).order_by("pk")
+        endpoints = {endpoint.pk: endpoint for endpoint in locked.only(*ADAPTIVE_STATE_FIELDS)}
+        checks = CheckResult.objects.bulk_create(
+            [CheckResult(endpoint=endpoint, **result) for endpoint, result in pairs]
+        )
+        update_incidents(checks)
+        update_adaptive_state(checks, endpoints)
+        user_ids = {endpoint.user_id for endpoint, _ in pairs}
+        # After commit, so no reader caches pre-commit data under the new version.
+        transaction.on_commit(lambda: bump_data_version(user_ids, SCOPE_CHECKS))
+    return checks
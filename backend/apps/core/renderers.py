@@ -0,0 +1,30 @@
+"""
+JSON renderer backed by orjson (optional dependency). Select it in
+REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"]; without orjson installed it falls back to
+DRF's JSONRenderer, so the output format is the same either way.
+"""
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    # OPT_UTC_Z matches DRF's "Z" suffix for UTC datetimes; types orjson doesn't know
+    # (Decimal, lazy strings, ...) go through DRF's encoder.
+    options = orjson.OPT_UTC_Z if orjson else 0
+    _default = JSONEncoder().default
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return JSONRenderer().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=self._default, option=self.options)
@@ -0,0 +1,133 @@
+"""
+When an endpoint is due for its next check.
+
+Fixed endpoints are checked every interval_minutes. Adaptive endpoints keep their own
+current interval between a floor and a ceiling:
+
+- a failed check drops the interval straight to the floor and resets the success streak;
+- once ADAPTIVE_STABLE_STREAK checks in a row have succeeded, each further success doubles
+  the interval, up to the ceiling.
+
+A flapping endpoint never builds a streak, so it stays at the floor until it has recovered.
+"""
+from django.conf import settings
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .models import CheckResult, Endpoint
+from .probes import group_by_target
+
+ADAPTIVE_STABLE_STREAK = 3
+
+
+def interval_bounds(endpoint):
+    """(floor, ceiling) in minutes for an adaptive endpoint."""
+    floor = endpoint.min_interval_minutes or settings.ADAPTIVE_INTERVAL_FLOOR_MINUTES
+    ceiling = endpoint.max_interval_minutes or settings.ADAPTIVE_INTERVAL_CEILING_MINUTES
+    floor = max(1, floor)
+    return floor, max(floor, ceiling)
+
+
+def effective_interval_minutes(endpoint):
+    if not endpoint.adaptive_interval:
+        return endpoint.interval_minutes
+    floor, ceiling = interval_bounds(endpoint)
+    current = endpoint.current_interval_minutes or endpoint.interval_minutes
+    return min(max(current, floor), ceiling)
+
+
+def next_adaptive_state(endpoint, success):
+    """(current_interval_minutes, success_streak) after a check with the given outcome."""
+    floor, ceiling = interval_bounds(endpoint)
+    if not success:
+        return floor, 0
+    streak = endpoint.success_streak + 1
+    current = effective_interval_minutes(endpoint)
+    if streak > ADAPTIVE_STABLE_STREAK:
+        current = min(current * 2, ceiling)
+    return current, streak
+
+
+# Endpoint fields next_adaptive_state reads; record_checks loads them under the row lock.
+ADAPTIVE_STATE_FIELDS = (
+    "adaptive_interval",
+    "interval_minutes",
+    "min_interval_minutes",
+    "max_interval_minutes",
+    "current_interval_minutes",
+    "success_streak",
+)
+
+
+def update_adaptive_state(checks, endpoints):
+    """
+    Advance adaptive endpoints' interval state from new CheckResults, oldest first.
+    endpoints maps pk -> Endpoint with ADAPTIVE_STATE_FIELDS as currently stored (read under
+    the row lock, not the possibly stale copies the checks were probed for); it is updated in place.
+    """
+    changed = {}
+    for check in sorted(checks, key=lambda c: c.checked_at):
+        endpoint = endpoints.get(check.endpoint_id)
+        if endpoint is None or not endpoint.adaptive_interval:
+            continue
+        state = next_adaptive_state(endpoint, check.success)
+        endpoint.current_interval_minutes, endpoint.success_streak = state
+        changed[endpoint.pk] = state
+    by_state = {}
+    for pk, state in changed.items():
+        by_state.setdefault(state, []).append(pk)
+    # One UPDATE per distinct state rather than per endpoint; update() leaves updated_at alone.
+    for (current, streak), pks in by_state.items():
+        Endpoint.objects.filter(pk__in=pks).update(
+            current_interval_minutes=current, success_streak=streak
+        )
+
+
+def with_last_checked_at(qs):
+    """Annotate an Endpoint queryset with _last_checked_at (None if never checked)."""
+    latest = (
+        CheckResult.objects.filter(endpoint=OuterRef("pk"))
+        .order_by("-checked_at")
+        .values("checked_at")[:1]
+    )
+    return qs.annotate(_last_checked_at=Subquery(latest))
+
+
+def is_due(endpoint, now):
+    """True if endpoint (annotated by with_last_checked_at) has never been checked or its last
+    check was at least its effective interval ago."""
+    if endpoint._last_checked_at is None:
+        return True
+    delta = now - endpoint._last_checked_at
+    return delta.total_seconds() >= effective_interval_minutes(endpoint) * 60
+
+
+def due_targets(endpoints, now):
+    """
+    Pick the probe targets to probe now, from endpoints annotated by with_last_checked_at.
+    A target is probed when any of its subscribers is due. Its result then goes to every
+    subscriber that would come due before the target's next probe, i.e. within the shortest
+    interval among them. Subscribers with the same interval but different phases so fall
+    into step after one probe, and a target is probed about once per shortest interval.
+    Subscribers checked within PROBE_FRESHNESS_SECONDS (e.g. by check-now) are left out:
+    they already have that result.
+    Returns ({target key: [endpoints to record the result for]}, number of endpoints skipped).
+    """
+    fresh_since = now - timezone.timedelta(seconds=settings.PROBE_FRESHNESS_SECONDS)
+    targets = {}
+    skipped = 0
+    for key, members in group_by_target(endpoints).items():
+        subscribers = []
+        if any(is_due(endpoint, now) for endpoint in members):
+            shortest = min(effective_interval_minutes(endpoint) for endpoint in members)
+            next_probe = now + timezone.timedelta(minutes=shortest)
+            subscribers = [
+                endpoint
+                for endpoint in members
+                if is_due(endpoint, next_probe)
+                and (endpoint._last_checked_at is None or endpoint._last_checked_at < fresh_since)
+            ]
+        if subscribers:
+            targets[key] = subscribers
+        skipped += len(members) - len(subscribers)
+    return targets, skipped
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Endpoint, CheckResult
+from .models import Endpoint, CheckResult, ProbeMode
 
 
 class CheckResultSerializer(serializers.ModelSerializer):
@@ -26,11 +26,33 @@ class EndpointSerializer(serializers.ModelSerializer):
             "name",
             "url",
             "interval_minutes",
+            "adaptive_interval",
+            "min_interval_minutes",
+            "max_interval_minutes",
+            "current_interval_minutes",
+            "probe_mode",
+            "max_body_bytes",
+            "expected_content",
             "created_at",
             "updated_at",
             "latest_check",
         )
-        read_only_fields = ("created_at", "updated_at", "latest_check")
+        read_only_fields = ("created_at", "updated_at", "current_interval_minutes", "latest_check")
+
+    def validate(self, attrs):
+        floor = attrs.get("min_interval_minutes", getattr(self.instance, "min_interval_minutes", None))
+        ceiling = attrs.get("max_interval_minutes", getattr(self.instance, "max_interval_minutes", None))
+        if floor is not None and ceiling is not None and floor > ceiling:
+            raise serializers.ValidationError(
+                {"max_interval_minutes": "Must be greater than or equal to min_interval_minutes."}
+            )
+        mode = attrs.get("probe_mode", getattr(self.instance, "probe_mode", ProbeMode.GET))
+        expected_content = attrs.get("expected_content", getattr(self.instance, "expected_content", ""))
+        if expected_content and mode not in (ProbeMode.GET, ProbeMode.GET_CAPPED):
+            raise serializers.ValidationError(
+                {"expected_content": "Content assertions need probe_mode 'get' or 'get_capped'."}
+            )
+        return attrs
 
     def get_latest_check(self, obj):
         latest = obj.checks.first()
@@ -49,6 +71,13 @@ class EndpointListSerializer(serializers.ModelSerializer):
             "name",
             "url",
             "interval_minutes",
+            "adaptive_interval",
+            "min_interval_minutes",
+            "max_interval_minutes",
+            "current_interval_minutes",
+            "probe_mode",
+            "max_body_bytes",
+            "expected_content",
             "created_at",
             "updated_at",
             "latest_check",
@@ -0,0 +1,77 @@
+"""
+Request validation of batch check-now, sync and async views. Every case here is rejected
+before anything is probed.
+
+    python manage.py test apps.core.tests.test_batch_check_now
+"""
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncRequestFactory, TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.core import async_views
+from apps.core.models import CheckResult, Endpoint
+
+INVALID_BODIES = [
+    ("array body", [1, 2]),
+    ("string body", "up"),
+    ("ids not a list", {"ids": 1}),
+    ("ids not integers", {"ids": ["1"]}),
+    ("unknown status", {"status": "DOWN"}),
+    ("nan deadline", {"deadline_seconds": "nan"}),
+    ("infinite deadline", {"deadline_seconds": "inf"}),
+]
+
+
+class BatchCheckNowValidationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="batch", password="x")
+        Endpoint.objects.create(user=cls.user, name="a", url="https://a.example.test/")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def test_invalid_bodies_are_rejected(self):
+        for name, body in INVALID_BODIES:
+            with self.subTest(name):
+                response = self.client.post("/endpoints/check-now/", body, format="json")
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("detail", response.json())
+        self.assertFalse(CheckResult.objects.exists())
+
+
+class AsyncBatchCheckNowValidationTests(TestCase):
+    """async_views.batch_check_now, called directly (its route depends on ASYNC_PROBE_VIEWS)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="abatch", password="x")
+        Endpoint.objects.create(user=cls.user, name="a", url="https://a.example.test/")
+
+    async def post(self, body, token=None):
+        request = AsyncRequestFactory().post(
+            "/endpoints/check-now/",
+            json.dumps(body),
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {token or AccessToken.for_user(self.user)}"},
+        )
+        return await async_views.batch_check_now(request)
+
+    async def test_invalid_bodies_are_rejected(self):
+        for name, body in INVALID_BODIES:
+            with self.subTest(name):
+                response = await self.post(body)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("detail", json.loads(response.content))
+        self.assertFalse(await CheckResult.objects.aexists())
+
+    async def test_invalid_token_renders_like_drf(self):
+        response = await self.post({}, token="garbage")
+        self.assertEqual(response.status_code, 401)
+        data = json.loads(response.content)
+        self.assertIsInstance(data["detail"], str)
+        self.assertEqual(data["code"], "token_not_valid")
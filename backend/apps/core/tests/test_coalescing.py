@@ -0,0 +1,106 @@
+"""
+Single-flight coalescing: one computing caller per key, created only for that caller,
+and reuse of results within the freshness window.
+
+    python manage.py test apps.core.tests.test_coalescing
+"""
+import asyncio
+import threading
+import time
+import uuid
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.core.coalescing import acoalesce, check_endpoint_now, coalesce
+from apps.core.models import CheckResult, Endpoint
+from apps.core.tests.test_scheduling import result
+
+CALLERS = 5
+
+
+class CoalesceTests(SimpleTestCase):
+    def setUp(self):
+        self.key = f"test:{uuid.uuid4().hex}"
+
+    def test_concurrent_callers_share_one_compute(self):
+        release = threading.Event()
+        computed = []
+
+        def compute():
+            computed.append(threading.get_ident())
+            release.wait(5)
+            return "result"
+
+        outcomes = []
+
+        def call():
+            outcomes.append(coalesce(self.key, compute, lambda: None, timeout=5))
+
+        threads = [threading.Thread(target=call) for _ in range(CALLERS)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.2)  # let the followers join the leader's future
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(len(computed), 1)
+        self.assertEqual(sorted(outcomes), [("result", False)] * (CALLERS - 1) + [("result", True)])
+
+    def test_fresh_result_is_returned_without_computing(self):
+        compute = mock.Mock()
+        self.assertEqual(coalesce(self.key, compute, lambda: "fresh", timeout=5), ("fresh", False))
+        compute.assert_not_called()
+
+    def test_key_is_free_again_after_the_leader_finishes(self):
+        self.assertEqual(coalesce(self.key, lambda: 1, lambda: None, timeout=5), (1, True))
+        self.assertEqual(coalesce(self.key, lambda: 2, lambda: None, timeout=5), (2, True))
+
+    async def test_async_callers_share_one_compute(self):
+        release = asyncio.Event()
+        computed = []
+
+        async def compute():
+            computed.append(1)
+            await release.wait()
+            return "result"
+
+        async def fetch_fresh():
+            return None
+
+        calls = [asyncio.ensure_future(acoalesce(self.key, compute, fetch_fresh, 5)) for _ in range(CALLERS)]
+        await asyncio.sleep(0.05)
+        release.set()
+        outcomes = await asyncio.gather(*calls)
+        self.assertEqual(len(computed), 1)
+        self.assertEqual(sorted(outcomes), [("result", False)] * (CALLERS - 1) + [("result", True)])
+
+
+@mock.patch("apps.core.coalescing.probe_endpoint", return_value=result(True))
+class CheckEndpointNowTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(username="coalesce", password="x")
+        cls.endpoint = Endpoint.objects.create(user=user, name="a", url="https://a.example.test/")
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(PROBE_FRESHNESS_SECONDS=15)
+    def test_check_within_freshness_window_is_reused(self, probe_endpoint):
+        first, created = check_endpoint_now(self.endpoint)
+        self.assertTrue(created)
+        again, created = check_endpoint_now(self.endpoint)
+        self.assertFalse(created)
+        self.assertEqual(again.pk, first.pk)
+        self.assertEqual(CheckResult.objects.filter(endpoint=self.endpoint).count(), 1)
+        self.assertEqual(probe_endpoint.call_count, 1)
+
+    @override_settings(PROBE_FRESHNESS_SECONDS=0)
+    def test_without_freshness_window_every_call_checks(self, probe_endpoint):
+        self.assertTrue(check_endpoint_now(self.endpoint)[1])
+        self.assertTrue(check_endpoint_now(self.endpoint)[1])
+        self.assertEqual(CheckResult.objects.filter(endpoint=self.endpoint).count(), 2)
+        self.assertEqual(probe_endpoint.call_count, 2)
@@ -0,0 +1,97 @@
+"""
+The incident log as written by record_checks, and the MTTR / uptime report read from it.
+
+    python manage.py test apps.core.tests.test_incidents
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.core.incidents import incident_report
+from apps.core.models import Endpoint, Incident
+from apps.core.recording import record_checks
+from apps.core.tests.test_scheduling import result
+
+
+class UpdateIncidentsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = get_user_model().objects.create_user(username="incidents", password="x")
+        cls.endpoint = Endpoint.objects.create(user=user, name="a", url="https://a.example.test/")
+
+    def test_failure_opens_one_incident(self):
+        [check] = record_checks([(self.endpoint, result(False))])
+        record_checks([(self.endpoint, result(False))])
+        incident = Incident.objects.get(endpoint=self.endpoint)
+        self.assertEqual(incident.started_at, check.checked_at)
+        self.assertIsNone(incident.ended_at)
+        self.assertEqual(incident.error_message, "HTTP 503")
+
+    def test_success_closes_the_open_incident(self):
+        [failure] = record_checks([(self.endpoint, result(False))])
+        [success] = record_checks([(self.endpoint, result(True))])
+        incident = Incident.objects.get(endpoint=self.endpoint)
+        self.assertEqual(incident.ended_at, success.checked_at)
+        self.assertEqual(
+            incident.duration_seconds, int((success.checked_at - failure.checked_at).total_seconds())
+        )
+
+    def test_success_without_open_incident_opens_nothing(self):
+        record_checks([(self.endpoint, result(True))])
+        self.assertFalse(Incident.objects.exists())
+
+    def test_failure_then_success_in_one_batch(self):
+        failure, success = record_checks([(self.endpoint, result(False)), (self.endpoint, result(True))])
+        incident = Incident.objects.get(endpoint=self.endpoint)
+        self.assertEqual((incident.started_at, incident.ended_at), (failure.checked_at, success.checked_at))
+
+
+class IncidentReportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="report", password="x")
+        cls.now = timezone.now().replace(microsecond=0)
+
+    def endpoint(self, created_ago):
+        endpoint = Endpoint.objects.create(user=self.user, name="a", url="https://a.example.test/")
+        Endpoint.objects.filter(pk=endpoint.pk).update(created_at=self.now - created_ago)
+        return Endpoint.objects.filter(pk=endpoint.pk)
+
+    def incident(self, endpoints, started_ago, ended_ago=None):
+        started_at = self.now - started_ago
+        ended_at = self.now - ended_ago if ended_ago is not None else None
+        Incident.objects.create(
+            endpoint=endpoints.get(),
+            started_at=started_at,
+            ended_at=ended_at,
+            duration_seconds=int((ended_at - started_at).total_seconds()) if ended_at else None,
+        )
+
+    def test_incidents_are_clipped_to_the_window(self):
+        endpoints = self.endpoint(created_ago=timedelta(days=10))
+        self.incident(endpoints, timedelta(hours=5), timedelta(hours=4))  # before the window
+        self.incident(endpoints, timedelta(hours=3), timedelta(minutes=90))  # 30 min inside
+        self.incident(endpoints, timedelta(minutes=30))  # still open: 30 min so far
+        report = incident_report(endpoints, self.now - timedelta(hours=2), self.now + timedelta(hours=1), self.now)
+        self.assertEqual(
+            report["summary"],
+            {"incident_count": 2, "mttr_seconds": 5400.0, "downtime_seconds": 3600.0, "uptime_pct": 50.0},
+        )
+        self.assertEqual(len(report["incidents"]), 2)
+
+    def test_observed_time_starts_at_endpoint_creation(self):
+        endpoints = self.endpoint(created_ago=timedelta(hours=1))
+        self.incident(endpoints, timedelta(minutes=30), timedelta(minutes=15))
+        report = incident_report(endpoints, self.now - timedelta(days=1), self.now, self.now)
+        self.assertEqual(report["summary"]["uptime_pct"], 75.0)
+        self.assertEqual(report["summary"]["mttr_seconds"], 900.0)
+
+    def test_mttr_ignores_incidents_ending_after_the_window(self):
+        endpoints = self.endpoint(created_ago=timedelta(days=10))
+        self.incident(endpoints, timedelta(hours=3), timedelta(hours=1))
+        report = incident_report(endpoints, self.now - timedelta(hours=4), self.now - timedelta(hours=2), self.now)
+        self.assertEqual(report["summary"]["incident_count"], 1)
+        self.assertIsNone(report["summary"]["mttr_seconds"])
+        self.assertEqual(report["summary"]["uptime_pct"], 50.0)
@@ -0,0 +1,51 @@
+"""
+When ProfilingMiddleware profiles a request and when it serves it unprofiled.
+
+    python manage.py test apps.core.tests.test_profiling
+"""
+import tempfile
+from unittest import mock
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from apps.core import profiling
+
+
+class ProfilingMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        profile_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(profile_dir.cleanup)
+        env = mock.patch.dict("os.environ", {"PROFILE_SECRET": "s3", "PROFILE_DIR": profile_dir.name})
+        env.start()
+        self.addCleanup(env.stop)
+        self.middleware = profiling.ProfilingMiddleware(lambda request: HttpResponse("ok"))
+
+    def get(self, multithread, **headers):
+        request = RequestFactory().get("/health", headers=headers)
+        request.META["wsgi.multithread"] = multithread
+        return self.middleware(request)
+
+    def test_unrequested_request_is_not_profiled(self):
+        response = self.get(multithread=False)
+        self.assertNotIn("X-Profile-File", response)
+        self.assertNotIn("X-Profile-Skipped", response)
+
+    def test_single_threaded_server_is_profiled(self):
+        for observes_all_threads in (False, True):
+            with self.subTest(observes_all_threads=observes_all_threads), mock.patch.object(
+                profiling, "PROFILER_OBSERVES_ALL_THREADS", observes_all_threads
+            ):
+                response = self.get(multithread=False, X_Profile="s3")
+                self.assertIn("X-Profile-File", response)
+
+    def test_threaded_server_is_skipped_when_profiler_observes_all_threads(self):
+        with mock.patch.object(profiling, "PROFILER_OBSERVES_ALL_THREADS", True):
+            response = self.get(multithread=True, X_Profile="s3")
+        self.assertEqual(response["X-Profile-Skipped"], "threads")
+        self.assertNotIn("X-Profile-File", response)
+
+    def test_threaded_server_is_profiled_when_profiler_observes_one_thread(self):
+        with mock.patch.object(profiling, "PROFILER_OBSERVES_ALL_THREADS", False):
+            response = self.get(multithread=True, X_Profile="s3")
+        self.assertIn("X-Profile-File", response)
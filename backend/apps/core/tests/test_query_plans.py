@@ -0,0 +1,96 @@
+"""
+EXPLAIN the hot read queries and fail if any of them reads a table (including aliased
+subquery tables) with a full scan instead of an index. Runs on SQLite by default and on
+Postgres with DATABASE_URL set; on Postgres sequential scans are disabled for the test so
+that, even on the small test tables, the plan shows whether a usable index exists at all.
+
+    python manage.py test apps.core.tests.test_query_plans
+"""
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.core.models import CheckResult, Endpoint
+from apps.core.projections import with_latest_check_id
+from apps.core.scheduling import with_last_checked_at
+from apps.core.views import (
+    _analytics_rows,
+    _checks_since,
+    _filter_by_latest_status,
+    _with_latest_success,
+)
+
+# Plan lines meaning "read every row of a table"; group 1 is the table (or its alias).
+# SQLite prints SEARCH for index lookups.
+FULL_SCAN_PATTERNS = {
+    "sqlite": re.compile(r"\bSCAN (?!CONSTANT ROW)(\S+)"),
+    "postgresql": re.compile(r"\bSeq Scan on (\S+)"),
+}
+
+
+def hot_queries(user_id, endpoint):
+    """
+    (name, queryset, tables it may read in full) for the read paths that must stay on
+    check_endpoint_latest_idx, built with the same helpers as the views.
+    """
+    now = timezone.now()
+    endpoints = Endpoint.objects.filter(user_id=user_id)
+    return [
+        # EndpointSerializer.get_latest_check: endpoint.checks.first()
+        ("latest check of one endpoint", endpoint.checks.all()[:1], ()),
+        (
+            "check history of one endpoint",
+            endpoint.checks.filter(checked_at__gte=now - timezone.timedelta(days=1))[:100],
+            (),
+        ),
+        (
+            "endpoint list filtered by latest status, with latest check ids",
+            with_latest_check_id(_filter_by_latest_status(endpoints, "up").order_by("-created_at")),
+            (),
+        ),
+        ("dashboard up/down counts", _with_latest_success(endpoints), ()),
+        ("dashboard 24h window", _checks_since(user_id, endpoints, now - timezone.timedelta(hours=24)), ()),
+        (
+            "analytics range grouped by endpoint and hour",
+            _analytics_rows(endpoints, now - timezone.timedelta(days=7), now, "hour", per_endpoint=True),
+            (),
+        ),
+        (
+            "analytics range grouped by day",
+            _analytics_rows(endpoints, now - timezone.timedelta(days=7), now, "day"),
+            (),
+        ),
+        # run_checks reads every endpoint; only the latest-check subquery must use the index.
+        (
+            "due endpoints with their last check",
+            with_last_checked_at(Endpoint.objects.all()),
+            ("core_endpoint",),
+        ),
+    ]
+
+
+class QueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("plans")
+        cls.endpoint = Endpoint.objects.create(user=cls.user, name="plans", url="https://example.com/health")
+        CheckResult.objects.bulk_create(
+            CheckResult(endpoint=cls.endpoint, status_code=200, response_time_ms=100 + i, success=bool(i % 10))
+            for i in range(50)
+        )
+
+    def test_hot_queries_use_indexes(self):
+        pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            self.skipTest(f"Plan checks support SQLite and Postgres, not {connection.vendor}.")
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        for name, qs, full_reads in hot_queries(self.user.pk, self.endpoint):
+            with self.subTest(name):
+                plan = qs.explain()
+                scanned = [table for table in pattern.findall(plan) if table not in full_reads]
+                self.assertEqual(scanned, [], f"{name} falls back to a full scan:\n{plan}")
@@ -0,0 +1,115 @@
+"""
+Adaptive interval state as written by record_checks, and which endpoints a run checks.
+
+    python manage.py test apps.core.tests.test_scheduling
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from apps.core.models import Endpoint
+from apps.core.recording import record_checks
+from apps.core.scheduling import due_targets
+
+
+def result(success):
+    """Probe result values as returned by probes.probe()."""
+    return {
+        "status_code": 200 if success else 503,
+        "response_time_ms": 10,
+        "success": success,
+        "error_message": "" if success else "HTTP 503",
+    }
+
+
+class AdaptiveStateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(username="sched", password="x")
+
+    def setUp(self):
+        self.endpoint = Endpoint.objects.create(
+            user=self.user,
+            name="adaptive",
+            url="https://adaptive.example.test/",
+            interval_minutes=5,
+            adaptive_interval=True,
+            min_interval_minutes=5,
+            max_interval_minutes=60,
+        )
+
+    def state(self):
+        self.endpoint.refresh_from_db()
+        return self.endpoint.current_interval_minutes, self.endpoint.success_streak
+
+    def test_doubles_after_stable_streak(self):
+        intervals = []
+        for _ in range(6):
+            record_checks([(self.endpoint, result(True))])
+            intervals.append(self.state()[0])
+        self.assertEqual(intervals, [5, 5, 5, 10, 20, 40])
+
+    def test_failure_drops_to_floor(self):
+        Endpoint.objects.filter(pk=self.endpoint.pk).update(current_interval_minutes=40, success_streak=6)
+        record_checks([(self.endpoint, result(False))])
+        self.assertEqual(self.state(), (5, 0))
+
+    def test_state_is_read_under_the_lock_not_from_a_stale_copy(self):
+        Endpoint.objects.filter(pk=self.endpoint.pk).update(current_interval_minutes=20, success_streak=5)
+        stale = Endpoint.objects.get(pk=self.endpoint.pk)  # e.g. loaded at the start of a cron run
+        record_checks([(Endpoint.objects.get(pk=self.endpoint.pk), result(False))])  # check-now mid-run
+        record_checks([(stale, result(True))])
+        self.assertEqual(self.state(), (5, 1))
+
+    def test_batch_is_applied_in_checked_at_order(self):
+        record_checks([(self.endpoint, result(False)), (self.endpoint, result(True))])
+        self.assertEqual(self.state(), (5, 1))
+
+
+@override_settings(PROBE_FRESHNESS_SECONDS=15)
+class DueTargetsTests(SimpleTestCase):
+    now = timezone.now()
+
+    def endpoint(self, name, checked_ago, interval_minutes=5, url="https://shared.example.test/"):
+        """An unsaved Endpoint as annotated by with_last_checked_at."""
+        endpoint = Endpoint(name=name, url=url, interval_minutes=interval_minutes)
+        endpoint._last_checked_at = self.now - checked_ago if checked_ago is not None else None
+        return endpoint
+
+    def names(self, endpoints):
+        targets, skipped = due_targets(endpoints, self.now)
+        return [[endpoint.name for endpoint in members] for members in targets.values()], skipped
+
+    def test_result_fans_out_to_subscribers_due_before_the_next_probe(self):
+        endpoints = [
+            self.endpoint("due", timedelta(minutes=6)),
+            self.endpoint("due in 2 min", timedelta(minutes=3)),
+            self.endpoint("due in 4 min", timedelta(minutes=1)),
+            self.endpoint("never checked", None),
+            self.endpoint("hourly, due in 50 min", timedelta(minutes=10), interval_minutes=60),
+        ]
+        self.assertEqual(
+            self.names(endpoints), ([["due", "due in 2 min", "due in 4 min", "never checked"]], 1)
+        )
+
+    def test_target_with_no_due_subscriber_is_not_probed(self):
+        endpoints = [
+            self.endpoint("a", timedelta(minutes=1)),
+            self.endpoint("b", timedelta(minutes=2)),
+            self.endpoint("other target, due", timedelta(minutes=9), url="https://other.example.test/"),
+        ]
+        self.assertEqual(self.names(endpoints), ([["other target, due"]], 2))
+
+    def test_subscribers_checked_within_the_freshness_window_are_left_out(self):
+        endpoints = [
+            self.endpoint("due", timedelta(minutes=6)),
+            self.endpoint("checked now", timedelta(seconds=5)),
+        ]
+        self.assertEqual(self.names(endpoints), ([["due"]], 1))
+
+    def test_target_whose_due_subscribers_are_all_fresh_is_not_probed(self):
+        endpoints = [self.endpoint("due but fresh", timedelta(seconds=90), interval_minutes=1)]
+        with override_settings(PROBE_FRESHNESS_SECONDS=120):
+            self.assertEqual(self.names(endpoints), ([], 1))
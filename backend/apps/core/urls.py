@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
+from . import async_views
 from . import auth_views
 
 router = DefaultRouter()
@@ -13,6 +15,7 @@ router.register(r"endpoints", views.EndpointViewSet, basename="endpoint")
 urlpatterns = [
     path("", include(router.urls)),
     path("endpoints", views.EndpointViewSet.as_view({"get": "list", "post": "create"})),
+    path("endpoints/check-now", views.EndpointViewSet.as_view({"post": "batch_check_now"})),
     path(
         "endpoints/<int:pk>",
         views.EndpointViewSet.as_view(
@@ -20,6 +23,7 @@ urlpatterns = [
         ),
     ),
     path("endpoints/<int:pk>/checks", views.EndpointViewSet.as_view({"get": "checks_list"})),
+    path("endpoints/<int:pk>/incidents", views.EndpointViewSet.as_view({"get": "incidents_list"})),
     path("endpoints/<int:pk>/check-now", views.EndpointViewSet.as_view({"post": "check_now"})),
     path("health/", views.health),
     path("health", views.health),
@@ -35,4 +39,17 @@ urlpatterns = [
     path("dashboard/stats", views.dashboard_stats),
     path("analytics/", views.analytics),
     path("analytics", views.analytics),
+    path("incidents/", views.incidents),
+    path("incidents", views.incidents),
 ]
+
+# Under ASGI the probe-bound views are served async. Listed first so they take precedence
+# over the router's check-now action.
+if settings.ASYNC_PROBE_VIEWS:
+    urlpatterns = [
+        path("endpoints/check-now/", async_views.batch_check_now),
+        path("endpoints/check-now", async_views.batch_check_now),
+        path("endpoints/<int:pk>/check-now/", async_views.check_now),
+        path("endpoints/<int:pk>/check-now", async_views.check_now),
+        path("cron/run-checks", async_views.run_checks),
+    ] + urlpatterns
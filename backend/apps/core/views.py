@@ -1,19 +1,30 @@
 import io
+import math
 import os
 import time
-import requests
+from datetime import datetime
 from django.core.management import call_command
 from django.http import JsonResponse
 from django.views.decorators.http import require_GET, require_http_methods
 from django.views.decorators.csrf import csrf_exempt
-from django.db.models import Avg, OuterRef, Subquery
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import TruncDate, TruncHour
 from django.utils import timezone
 from rest_framework import viewsets
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ParseError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from .cache import SCOPE_ENDPOINTS, bump_data_version, cached_response_data
+from .coalescing import check_endpoint_now, coalesced_probe, fresh_checks
+from .incidents import incident_report
 from .models import Endpoint, CheckResult
+from .probes import probe_many
+from .profiling import profile, profiling_skip_reason
+from .projections import check_result_rows, endpoint_list_rows, project_rows
+from .recording import record_checks
+from .scheduling import due_targets, with_last_checked_at
 from .serializers import (
     EndpointSerializer,
     EndpointListSerializer,
@@ -21,6 +32,17 @@ from .serializers import (
 )
 
 
+# Batch check-now: concurrent probes per request and the overall time budget for all of them.
+BATCH_CHECK_MAX_ENDPOINTS = 500
+BATCH_CHECK_MAX_WORKERS = 20
+BATCH_CHECK_DEADLINE_SECONDS = 25
+
+# run_checks writes results as probes finish, in chunks of this many targets or seconds, so a
+# run cut off at the function's time limit keeps the checks it already completed.
+RUN_CHECKS_FLUSH_TARGETS = 20
+RUN_CHECKS_FLUSH_SECONDS = 5
+
+
 def health(request):
     return JsonResponse({"status": "ok"})
 
@@ -56,190 +78,373 @@ def _validate_cron_secret(request):
     return request.GET.get("secret") == secret
 
 
-def _endpoint_is_due(endpoint):
-    """True if endpoint has no last check or last check was >= interval_minutes ago."""
-    latest = endpoint.checks.first()
-    if latest is None:
-        return True
-    delta = timezone.now() - latest.checked_at
-    return delta.total_seconds() >= endpoint.interval_minutes * 60
+def _parse_iso_datetime(value):
+    """Parse an ISO 8601 query param (trailing Z allowed) to an aware datetime; None if missing or invalid."""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError):
+        return None
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt)
+    return dt
 
 
 @csrf_exempt
 @require_http_methods(["GET", "POST"])
 def run_checks(request):
     """
-    Run health checks for all endpoints that are "due" based on their interval_minutes.
+    Run health checks for all endpoints that are "due" based on their interval_minutes
+    (or, for adaptive endpoints, their current adaptive interval).
     Called by Vercel Cron every minute; only endpoints whose last check was at least
-    interval_minutes ago (or never checked) are pinged.
+    that interval ago (or never checked) are pinged.
+    With ?profile=1 the run is profiled (see apps/core/profiling.py) and the response
+    includes a "profile" summary with the saved pstats file, unless X-Profile-Skipped says why not.
     """
     if not _validate_cron_secret(request):
         return JsonResponse({"error": "Unauthorized"}, status=401)
-    checked = 0
-    failed = 0
-    skipped = 0
-    timeout_seconds = 10
-    for endpoint in Endpoint.objects.all():
-        if not _endpoint_is_due(endpoint):
-            skipped += 1
-            continue
-        start = time.perf_counter()
-        try:
-            r = requests.get(endpoint.url, timeout=timeout_seconds)
-            elapsed_ms = int((time.perf_counter() - start) * 1000)
-            success = 200 <= r.status_code < 300
-            CheckResult.objects.create(
-                endpoint=endpoint,
-                status_code=r.status_code,
-                response_time_ms=elapsed_ms,
-                success=success,
-                error_message="" if success else f"HTTP {r.status_code}",
-            )
-            checked += 1
-            if not success:
-                failed += 1
-        except Exception as e:
-            elapsed_ms = int((time.perf_counter() - start) * 1000)
-            CheckResult.objects.create(
-                endpoint=endpoint,
-                status_code=None,
-                response_time_ms=elapsed_ms,
-                success=False,
-                error_message=str(e),
-            )
-            checked += 1
-            failed += 1
-    return JsonResponse({"checked": checked, "failed": failed, "skipped": skipped})
+    if request.GET.get("profile", "").lower() in ("1", "true", "yes"):
+        skip_reason = profiling_skip_reason(request)
+        if skip_reason:
+            response = JsonResponse(_run_due_checks())
+            response["X-Profile-Skipped"] = skip_reason
+            return response
+        with profile("run_checks") as run:
+            data = _run_due_checks()
+        if run is not None:
+            data["profile"] = run.summary()
+        return JsonResponse(data)
+    return JsonResponse(_run_due_checks())
+
+
+def _run_summary(pairs, skipped, probed):
+    failed = sum(1 for _, result in pairs if not result["success"])
+    return {"checked": len(pairs), "failed": failed, "skipped": skipped, "probed": probed}
+
+
+class _RunWriter:
+    """Collects the (endpoint, result) pairs of a run and writes them with record_checks in chunks."""
+
+    def __init__(self):
+        self.pairs = []
+        self._pending = []
+        self._pending_targets = 0
+        self._last_flush = time.monotonic()
+
+    def add(self, members, result):
+        """Queue one target's result for its endpoints. Returns True when a flush is due."""
+        pairs = [(endpoint, result) for endpoint in members]
+        self.pairs.extend(pairs)
+        self._pending.extend(pairs)
+        self._pending_targets += 1
+        return (
+            self._pending_targets >= RUN_CHECKS_FLUSH_TARGETS
+            or time.monotonic() - self._last_flush >= RUN_CHECKS_FLUSH_SECONDS
+        )
+
+    def flush(self):
+        record_checks(self._pending)
+        self._pending = []
+        self._pending_targets = 0
+        self._last_flush = time.monotonic()
+
+
+def _run_due_checks():
+    # Endpoints sharing a probe target get one probe; see due_targets for who receives it.
+    # A result probed moments ago (e.g. by check-now) is reused rather than probed again.
+    targets, skipped = due_targets(with_last_checked_at(Endpoint.objects.all()), timezone.now())
+    writer = _RunWriter()
+    for members in targets.values():
+        if writer.add(members, coalesced_probe(members[0])):
+            writer.flush()
+    writer.flush()
+    return _run_summary(writer.pairs, skipped, len(targets))
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def dashboard_stats(request):
-    endpoints = Endpoint.objects.filter(user=request.user)
     endpoint_id = request.query_params.get("endpoint_id")
+    data = cached_response_data(
+        request.user.id,
+        "dashboard_stats",
+        {"endpoint_id": endpoint_id},
+        lambda: _dashboard_stats_data(request.user.id, endpoint_id),
+    )
+    return Response(data)
+
+
+def _dashboard_stats_data(user_id, endpoint_id):
+    endpoints = Endpoint.objects.filter(user_id=user_id)
     if endpoint_id:
         endpoints = endpoints.filter(pk=endpoint_id)
     total_endpoints = endpoints.count()
     now = timezone.now()
     since_24h = now - timezone.timedelta(hours=24)
-    up_count = 0
-    down_count = 0
-    for ep in endpoints:
-        latest = ep.checks.first()
-        if latest:
-            if latest.success:
-                up_count += 1
-            else:
-                down_count += 1
-    checks_24h = CheckResult.objects.filter(
-        endpoint__user=request.user,
-        endpoint__in=endpoints,
-        checked_at__gte=since_24h,
+    counts = _with_latest_success(endpoints).aggregate(
+        up_count=Count("pk", filter=Q(_latest_success=True)),
+        down_count=Count("pk", filter=Q(_latest_success=False)),
     )
+    up_count = counts["up_count"]
+    down_count = counts["down_count"]
+    checks_24h = _checks_since(user_id, endpoints, since_24h)
     total_checks_24h = checks_24h.count()
     success_checks_24h = checks_24h.filter(success=True).count()
     uptime_pct_24h = (
         round(100.0 * success_checks_24h / total_checks_24h, 1)
         if total_checks_24h else None
     )
-    recent_checks = (
-        CheckResult.objects.filter(endpoint__user=request.user)
-        .select_related("endpoint")
-        .order_by("-checked_at")[:10]
+    recent_checks = CheckResult.objects.filter(endpoint__user_id=user_id).order_by("-checked_at")[:10]
+    recent_checks_data = project_rows(
+        recent_checks.annotate(endpoint_name=F("endpoint__name")),
+        (
+            "id",
+            "endpoint_id",
+            "endpoint_name",
+            "success",
+            "status_code",
+            "response_time_ms",
+            "checked_at",
+            "error_message",
+        ),
     )
-    recent_checks_data = [
-        {
-            "id": c.id,
-            "endpoint_id": c.endpoint_id,
-            "endpoint_name": c.endpoint.name,
-            "success": c.success,
-            "status_code": c.status_code,
-            "response_time_ms": c.response_time_ms,
-            "checked_at": c.checked_at.isoformat(),
-            "error_message": c.error_message,
-        }
-        for c in recent_checks
-    ]
-    return Response({
+    return {
         "total_endpoints": total_endpoints,
         "up_count": up_count,
         "down_count": down_count,
         "uptime_pct_24h": uptime_pct_24h,
         "recent_checks": recent_checks_data,
-    })
+    }
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def analytics(request):
-    endpoints = Endpoint.objects.filter(user=request.user)
+    """
+    Uptime and response-time series over [since, until] (default: last 7 days), bucketed by
+    group_by=day|hour. endpoint_id restricts to one endpoint; endpoint_ids=1,2,3 or
+    group_by_endpoint=true returns one series per endpoint (under "endpoints") plus the
+    overall summary, all from a single grouped query.
+    """
+    endpoints = Endpoint.objects.filter(user_id=request.user.id)
     endpoint_id = request.query_params.get("endpoint_id")
     if endpoint_id:
         endpoints = endpoints.filter(pk=endpoint_id)
+    endpoint_ids = request.query_params.get("endpoint_ids")
+    if endpoint_ids:
+        try:
+            ids = sorted({int(i) for i in endpoint_ids.split(",") if i.strip()})
+        except ValueError:
+            return Response(
+                {"detail": "endpoint_ids must be a comma-separated list of integers"}, status=400
+            )
+        endpoints = endpoints.filter(pk__in=ids)
+        endpoint_ids = ",".join(str(i) for i in ids)
+    per_endpoint = bool(endpoint_ids) or (
+        request.query_params.get("group_by_endpoint", "").lower() in ("true", "1", "yes")
+    )
     since = request.query_params.get("since")
     until = request.query_params.get("until")
     group_by = request.query_params.get("group_by", "day")
-    if not since:
-        since_dt = timezone.now() - timezone.timedelta(days=7)
-    else:
-        try:
-            from datetime import datetime
-            since_dt = datetime.fromisoformat(since.replace("Z", "+00:00"))
-            if timezone.is_naive(since_dt):
-                since_dt = timezone.make_aware(since_dt)
-        except (ValueError, TypeError):
-            since_dt = timezone.now() - timezone.timedelta(days=7)
-    if until:
-        try:
-            from datetime import datetime
-            until_dt = datetime.fromisoformat(until.replace("Z", "+00:00"))
-            if timezone.is_naive(until_dt):
-                until_dt = timezone.make_aware(until_dt)
-        except (ValueError, TypeError):
-            until_dt = timezone.now()
-    else:
-        until_dt = timezone.now()
+    now = timezone.now()
+    parsed_since = _parse_iso_datetime(since)
+    parsed_until = _parse_iso_datetime(until)
+    since_dt = parsed_since or now - timezone.timedelta(days=7)
+    until_dt = parsed_until or now
+    # An explicit window that ended in the past can't receive new checks.
+    closed = parsed_since is not None and parsed_until is not None and parsed_until < now
+    data = cached_response_data(
+        request.user.id,
+        "analytics",
+        {
+            "endpoint_id": endpoint_id,
+            "endpoint_ids": endpoint_ids,
+            "group_by_endpoint": per_endpoint,
+            "since": since,
+            "until": until,
+            "group_by": group_by,
+        },
+        lambda: _analytics_data(endpoints, since_dt, until_dt, group_by, per_endpoint),
+        closed=closed,
+    )
+    return Response(data)
+
+
+def _analytics_point(row):
+    total = row["total_checks"]
+    success = row["success_count"]
+    timed = row["response_time_count"]
+    return {
+        "period": row["period"].isoformat() if hasattr(row["period"], "isoformat") else str(row["period"]),
+        "total_checks": total,
+        "failure_count": total - success,
+        "uptime_pct": round(100.0 * success / total, 1) if total else 0,
+        "avg_response_time_ms": round(row["response_time_sum"] / timed, 1) if timed else 0,
+    }
+
+
+def _analytics_summary(rows):
+    """Summary over the grouped rows, equal to aggregating the raw checks directly."""
+    total = sum(row["total_checks"] for row in rows)
+    success = sum(row["success_count"] for row in rows)
+    timed = sum(row["response_time_count"] for row in rows)
+    response_time_sum = sum(row["response_time_sum"] or 0 for row in rows)
+    return {
+        "uptime_pct": round(100.0 * success / total, 1) if total else 0,
+        "avg_response_time_ms": round(response_time_sum / timed, 1) if timed else 0,
+        "total_checks": total,
+    }
+
+
+def _checks_since(user_id, endpoints, since_dt):
+    """The user's checks of the given endpoints since since_dt (dashboard window)."""
+    return CheckResult.objects.filter(
+        endpoint__user_id=user_id,
+        endpoint__in=endpoints,
+        checked_at__gte=since_dt,
+    )
+
+
+def _analytics_rows(endpoints, since_dt, until_dt, group_by, per_endpoint=False):
+    """
+    Checks in [since_dt, until_dt] grouped by (endpoint,) period, as one query. Sums rather
+    than averages are selected so the per-endpoint series and the summaries can be rolled
+    up from the same rows exactly.
+    """
     qs = CheckResult.objects.filter(
         endpoint__in=endpoints,
         checked_at__gte=since_dt,
         checked_at__lte=until_dt,
     )
     if group_by == "hour":
-        from django.db.models.functions import TruncHour
         qs = qs.annotate(period=TruncHour("checked_at"))
     else:
-        from django.db.models.functions import TruncDate
         qs = qs.annotate(period=TruncDate("checked_at"))
-    from django.db.models import Count, Avg, Q
-    series = []
-    for row in qs.values("period").annotate(
+    keys = ("endpoint_id", "period") if per_endpoint else ("period",)
+    return qs.values(*keys).annotate(
         total_checks=Count("id"),
-        failure_count=Count("id", filter=Q(success=False)),
         success_count=Count("id", filter=Q(success=True)),
-        avg_response_time_ms=Avg("response_time_ms"),
-    ).order_by("period"):
-        total = row["total_checks"]
-        success = row["success_count"]
-        series.append({
-            "period": row["period"].isoformat() if hasattr(row["period"], "isoformat") else str(row["period"]),
-            "total_checks": total,
-            "failure_count": row["failure_count"],
-            "uptime_pct": round(100.0 * success / total, 1) if total else 0,
-            "avg_response_time_ms": round(row["avg_response_time_ms"] or 0, 1),
-        })
-    all_checks = CheckResult.objects.filter(
-        endpoint__in=endpoints,
-        checked_at__gte=since_dt,
-        checked_at__lte=until_dt,
+        response_time_sum=Sum("response_time_ms"),
+        response_time_count=Count("response_time_ms"),
+    ).order_by(*keys)
+
+
+def _analytics_data(endpoints, since_dt, until_dt, group_by, per_endpoint=False):
+    rows = list(_analytics_rows(endpoints, since_dt, until_dt, group_by, per_endpoint))
+    summary = _analytics_summary(rows)
+    if not per_endpoint:
+        return {"series": [_analytics_point(row) for row in rows], "summary": summary}
+    rows_by_endpoint = {}
+    for row in rows:
+        rows_by_endpoint.setdefault(row["endpoint_id"], []).append(row)
+    return {
+        "endpoints": [
+            {
+                "endpoint_id": ep_id,
+                "name": name,
+                "series": [_analytics_point(row) for row in rows_by_endpoint.get(ep_id, [])],
+                "summary": _analytics_summary(rows_by_endpoint.get(ep_id, [])),
+            }
+            for ep_id, name in endpoints.order_by("-created_at").values_list("id", "name")
+        ],
+        "summary": summary,
+    }
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def incidents(request):
+    """
+    Incident history with MTTR and time-weighted uptime over [since, until] (default: last
+    7 days), read from the incident log. endpoint_id restricts to one endpoint.
+    """
+    endpoints = Endpoint.objects.filter(user_id=request.user.id)
+    endpoint_id = request.query_params.get("endpoint_id")
+    if endpoint_id:
+        endpoints = endpoints.filter(pk=endpoint_id)
+    return _incidents_response(request, endpoints, endpoint_id)
+
+
+def _incidents_response(request, endpoints, endpoint_id):
+    since = request.query_params.get("since")
+    until = request.query_params.get("until")
+    now = timezone.now()
+    parsed_since = _parse_iso_datetime(since)
+    parsed_until = _parse_iso_datetime(until)
+    since_dt = parsed_since or now - timezone.timedelta(days=7)
+    until_dt = parsed_until or now
+    data = cached_response_data(
+        request.user.id,
+        "incidents",
+        {"endpoint_id": endpoint_id, "since": since, "until": until},
+        lambda: incident_report(endpoints, since_dt, until_dt, now),
     )
-    total_all = all_checks.count()
-    success_all = all_checks.filter(success=True).count()
-    summary = {
-        "uptime_pct": round(100.0 * success_all / total_all, 1) if total_all else 0,
-        "avg_response_time_ms": round(all_checks.aggregate(Avg("response_time_ms"))["response_time_ms__avg"] or 0, 1),
-        "total_checks": total_all,
+    return Response(data)
+
+
+def _with_latest_success(qs):
+    """Annotate an Endpoint queryset with _latest_success (None if never checked)."""
+    latest_success = (
+        CheckResult.objects.filter(endpoint=OuterRef("pk"))
+        .order_by("-checked_at")
+        .values("success")[:1]
+    )
+    return qs.annotate(_latest_success=Subquery(latest_success))
+
+
+def _filter_by_latest_status(qs, status_filter):
+    """Restrict an Endpoint queryset to those whose latest check is up or down."""
+    if status_filter not in ("up", "down"):
+        return qs
+    return _with_latest_success(qs).filter(_latest_success=(status_filter == "up"))
+
+
+def _batch_selection(user_id, data, status_param=None):
+    """
+    Validate a batch check-now body. Returns (endpoints, ids, deadline_seconds); raises
+    ParseError (400) for a body that isn't an object, invalid ids, status or deadline_seconds,
+    or too many endpoints.
+    """
+    if not isinstance(data, dict):
+        # Treating it as "no filter" would probe every endpoint of the user.
+        raise ParseError("Body must be a JSON object")
+    ids = data.get("ids")
+    if ids is not None and (
+        not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids)
+    ):
+        raise ParseError("ids must be a list of integers")
+    status_filter = data.get("status", status_param)
+    if status_filter is not None and status_filter not in ("up", "down"):
+        # Ignoring an unknown filter would probe every endpoint of the user.
+        raise ParseError('status must be "up" or "down"')
+    qs = _filter_by_latest_status(Endpoint.objects.filter(user_id=user_id), status_filter)
+    if ids is not None:
+        qs = qs.filter(pk__in=ids)
+    endpoints = list(qs.order_by("-created_at")[:BATCH_CHECK_MAX_ENDPOINTS + 1])
+    if len(endpoints) > BATCH_CHECK_MAX_ENDPOINTS:
+        raise ParseError(f"At most {BATCH_CHECK_MAX_ENDPOINTS} endpoints can be checked per request")
+    try:
+        deadline = float(data.get("deadline_seconds", BATCH_CHECK_DEADLINE_SECONDS))
+    except (TypeError, ValueError):
+        deadline = BATCH_CHECK_DEADLINE_SECONDS
+    if not math.isfinite(deadline):
+        raise ParseError("deadline_seconds must be a finite number")
+    return endpoints, ids, min(max(deadline, 1.0), BATCH_CHECK_DEADLINE_SECONDS)
+
+
+def _batch_results(endpoints, ids, fresh, created, unfinished):
+    """Batch check-now response body: fresh checks ("created": false), then the new ones."""
+    checks = [(check, False) for check in fresh.values()] + [(check, True) for check in created]
+    found = {ep.pk for ep in endpoints}
+    return {
+        "results": [
+            {"endpoint_id": c.endpoint_id, "created": is_new, **CheckResultSerializer(c).data}
+            for c, is_new in checks
+        ],
+        "timed_out": [ep.pk for ep in unfinished],
+        "not_found": [i for i in ids if i not in found] if ids is not None else [],
     }
-    return Response({"series": series, "summary": summary})
 
 
 class EndpointViewSet(viewsets.ModelViewSet):
@@ -247,21 +452,8 @@ class EndpointViewSet(viewsets.ModelViewSet):
     queryset = Endpoint.objects.all()
 
     def get_queryset(self):
-        qs = Endpoint.objects.filter(user=self.request.user)
-        status_filter = self.request.query_params.get("status")
-        if status_filter in ("up", "down"):
-            from django.db.models import OuterRef, Subquery
-            from .models import CheckResult
-            latest_success = (
-                CheckResult.objects.filter(endpoint=OuterRef("pk"))
-                .order_by("-checked_at")
-                .values("success")[:1]
-            )
-            qs = qs.annotate(_latest_success=Subquery(latest_success))
-            if status_filter == "up":
-                qs = qs.filter(_latest_success=True)
-            else:
-                qs = qs.filter(_latest_success=False)
+        qs = Endpoint.objects.filter(user_id=self.request.user.id)
+        qs = _filter_by_latest_status(qs, self.request.query_params.get("status"))
         return qs.order_by("-created_at")
 
     def get_serializer_class(self):
@@ -269,55 +461,70 @@ class EndpointViewSet(viewsets.ModelViewSet):
             return EndpointListSerializer
         return EndpointSerializer
 
+    def list(self, request, *args, **kwargs):
+        status_filter = request.query_params.get("status")
+        data = cached_response_data(
+            request.user.id,
+            "endpoint_list",
+            {"status": status_filter},
+            lambda: endpoint_list_rows(self.filter_queryset(self.get_queryset())),
+        )
+        return Response(data)
+
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.id)
+        bump_data_version([self.request.user.id], SCOPE_ENDPOINTS)
+
+    def perform_update(self, serializer):
+        serializer.save()
+        bump_data_version([self.request.user.id], SCOPE_ENDPOINTS)
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        bump_data_version([self.request.user.id], SCOPE_ENDPOINTS)
 
     @action(detail=True, methods=["get"], url_path="checks")
     def checks_list(self, request, pk=None):
         endpoint = self.get_object()
         limit = min(int(request.GET.get("limit", 100)), 500)
-        since = request.GET.get("since")
+        since_dt = _parse_iso_datetime(request.GET.get("since"))
         qs = endpoint.checks.all()
-        if since:
-            from django.utils import timezone
-            from datetime import datetime
-            try:
-                since_dt = datetime.fromisoformat(since.replace("Z", "+00:00"))
-                if timezone.is_naive(since_dt):
-                    since_dt = timezone.make_aware(since_dt)
-                qs = qs.filter(checked_at__gte=since_dt)
-            except (ValueError, TypeError):
-                pass
-        qs = qs[:limit]
-        serializer = CheckResultSerializer(qs, many=True)
-        return Response(serializer.data)
+        if since_dt:
+            qs = qs.filter(checked_at__gte=since_dt)
+        return Response(check_result_rows(qs[:limit]))
+
+    @action(detail=True, methods=["get"], url_path="incidents")
+    def incidents_list(self, request, pk=None):
+        endpoint = self.get_object()
+        return _incidents_response(request, Endpoint.objects.filter(pk=endpoint.pk), str(endpoint.pk))
 
     @action(detail=True, methods=["post"], url_path="check-now")
     def check_now(self, request, pk=None):
         endpoint = self.get_object()
         if endpoint.user_id != request.user.id:
             return Response({"detail": "Not found"}, status=404)
-        timeout_seconds = 10
-        start = time.perf_counter()
-        try:
-            r = requests.get(endpoint.url, timeout=timeout_seconds)
-            elapsed_ms = int((time.perf_counter() - start) * 1000)
-            success = 200 <= r.status_code < 300
-            check = CheckResult.objects.create(
-                endpoint=endpoint,
-                status_code=r.status_code,
-                response_time_ms=elapsed_ms,
-                success=success,
-                error_message="" if success else f"HTTP {r.status_code}",
-            )
-        except Exception as e:
-            elapsed_ms = int((time.perf_counter() - start) * 1000)
-            check = CheckResult.objects.create(
-                endpoint=endpoint,
-                status_code=None,
-                response_time_ms=elapsed_ms,
-                success=False,
-                error_message=str(e),
-            )
+        check, created = check_endpoint_now(endpoint)
         serializer = CheckResultSerializer(check)
-        return Response(serializer.data, status=201)
+        return Response(serializer.data, status=201 if created else 200)
+
+    @action(detail=False, methods=["post"], url_path="check-now")
+    def batch_check_now(self, request):
+        """
+        Probe many endpoints concurrently in one request and write all results in one batch.
+        Body: {"ids": [1, 2, ...]} and/or {"status": "up"|"down"}; optional "deadline_seconds".
+        With neither ids nor status, every endpoint of the user is checked. Endpoints checked
+        within PROBE_FRESHNESS_SECONDS return that check ("created": false).
+        """
+        endpoints, ids, deadline = _batch_selection(
+            request.user.id, request.data, request.query_params.get("status")
+        )
+        # Endpoints checked within the freshness window get that check back instead of a copy.
+        fresh = fresh_checks([ep.pk for ep in endpoints])
+        results, unfinished = probe_many(
+            [ep for ep in endpoints if ep.pk not in fresh],
+            deadline,
+            max_workers=BATCH_CHECK_MAX_WORKERS,
+            probe_fn=coalesced_probe,
+        )
+        created = record_checks((ep, results[ep.pk]) for ep in endpoints if ep.pk in results)
+        return Response(_batch_results(endpoints, ids, fresh, created, unfinished), status=201)